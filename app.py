@@ -12,11 +12,15 @@ st.set_page_config(
 )
 
 # Load custom CSS
+@st.cache_data(show_spinner=False)
+def _read_css(path: str) -> str:
+    css_file = Path(path)
+    return css_file.read_text() if css_file.exists() else ""
+
 def load_css():
-    css_file = Path("assets/styles/custom.css")
-    if css_file.exists():
-        with open(css_file) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    css = _read_css("assets/styles/custom.css")
+    if css:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
 load_css()
 
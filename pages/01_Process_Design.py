@@ -1,6 +1,7 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
 from src.utils.validators import validate_process_parameters, ValidationError
 from src.process.mass_balance import MaterialBalanceCalculator
@@ -15,6 +16,106 @@ st.set_page_config(
 st.title("⚗️ Process Design & Material Balance")
 st.markdown("Define your chemical process parameters and calculate material balances.")
 
+@st.cache_data(show_spinner=False)
+def load_material_template(process_type: str) -> tuple:
+    """
+    Return the (raw_materials, products) lists of a built-in process template
+    """
+    if process_type == 'continuous':
+        raw_materials = [
+            {'name': 'Feedstock', 'price': 1.20, 'consumption_rate': 1050},
+            {'name': 'Solvent', 'price': 3.00, 'consumption_rate': 150}
+        ]
+        products = [
+            {'name': 'Main Product', 'price': 6.20, 'yield': 92},
+            {'name': 'By-product', 'price': 2.10, 'yield': 8}
+        ]
+    else:
+        raw_materials = [
+            {'name': 'Reactant A', 'price': 2.50, 'consumption_rate': 800},
+            {'name': 'Reactant B', 'price': 1.80, 'consumption_rate': 200},
+            {'name': 'Catalyst', 'price': 50.0, 'consumption_rate': 5}
+        ]
+        products = [
+            {'name': 'Product X', 'price': 8.50, 'yield': 85}
+        ]
+    return raw_materials, products
+
+def build_materials_df(raw_materials: list, production_rate: float) -> pd.DataFrame:
+    """
+    Build the raw material table with annual costs
+    """
+    n_materials = len(raw_materials)
+    material_prices = np.fromiter((m['price'] for m in raw_materials), dtype=np.float64, count=n_materials)
+    consumption_rates = np.fromiter((m['consumption_rate'] for m in raw_materials), dtype=np.float64, count=n_materials)
+    
+    return pd.DataFrame({
+        'name': [m['name'] for m in raw_materials],
+        'price': material_prices,
+        'consumption_rate': consumption_rates,
+        'Annual Cost ($)': material_prices * consumption_rates * production_rate
+    })
+
+def build_products_df(products: list, production_rate: float) -> pd.DataFrame:
+    """
+    Build the product table with production rates and annual revenues
+    """
+    n_products = len(products)
+    product_prices = np.fromiter((p['price'] for p in products), dtype=np.float64, count=n_products)
+    yields = np.fromiter((p['yield'] for p in products), dtype=np.float64, count=n_products)
+    product_rates = production_rate * yields / 100
+    
+    return pd.DataFrame({
+        'name': [p['name'] for p in products],
+        'price': product_prices,
+        'yield': yields,
+        'Production Rate (tons/year)': product_rates,
+        'Annual Revenue ($)': product_rates * product_prices * 1000  # Convert tons to kg
+    })
+
+def get_cached_table(table_name: str, cache_key: tuple, builder, *args) -> pd.DataFrame:
+    """
+    Return a table kept in session state, rebuilding it only when its inputs changed
+    """
+    if st.session_state.get(f'_{table_name}_key') != cache_key:
+        st.session_state[f'_{table_name}_key'] = cache_key
+        st.session_state[f'_cached_{table_name}_df'] = builder(*args)
+    return st.session_state[f'_cached_{table_name}_df']
+
+# Editing the add forms only reruns the form; adding an item reruns the page
+# because the tables, totals and summary all depend on the item lists
+@st.fragment
+def add_material_form():
+    with st.expander("Add Raw Material", expanded=len(st.session_state.raw_materials) == 0):
+        material_name = st.text_input("Material Name")
+        material_price = st.number_input("Price ($/kg)", min_value=0.0, value=1.0, step=0.1)
+        consumption_rate = st.number_input("Consumption Rate (kg/ton product)", min_value=0.0, value=100.0)
+        
+        if st.button("Add Material"):
+            if material_name:
+                st.session_state.raw_materials.append({
+                    'name': material_name,
+                    'price': material_price,
+                    'consumption_rate': consumption_rate
+                })
+                st.rerun()
+
+@st.fragment
+def add_product_form():
+    with st.expander("Add Product", expanded=len(st.session_state.products) == 0):
+        product_name = st.text_input("Product Name")
+        product_price = st.number_input("Selling Price ($/kg)", min_value=0.0, value=5.0, step=0.1)
+        yield_percentage = st.number_input("Yield (%)", min_value=1.0, max_value=100.0, value=90.0)
+        
+        if st.button("Add Product"):
+            if product_name:
+                st.session_state.products.append({
+                    'name': product_name,
+                    'price': product_price,
+                    'yield': yield_percentage
+                })
+                st.rerun()
+
 # Initialize session state
 if 'process_data' not in st.session_state:
     st.session_state.process_data = {}
@@ -96,32 +197,19 @@ if 'raw_materials' not in st.session_state:
 col1, col2 = st.columns([3, 1])
 
 with col1:
-    with st.expander("Add Raw Material", expanded=len(st.session_state.raw_materials) == 0):
-        material_name = st.text_input("Material Name")
-        material_price = st.number_input("Price ($/kg)", min_value=0.0, value=1.0, step=0.1)
-        consumption_rate = st.number_input("Consumption Rate (kg/ton product)", min_value=0.0, value=100.0)
-        
-        if st.button("Add Material"):
-            if material_name:
-                st.session_state.raw_materials.append({
-                    'name': material_name,
-                    'price': material_price,
-                    'consumption_rate': consumption_rate
-                })
-                st.success(f"Added {material_name}")
-                st.rerun()
+    add_material_form()
 
 with col2:
     if st.session_state.raw_materials and st.button("🗑️ Clear All Materials"):
         st.session_state.raw_materials = []
-        st.rerun()
 
 # Display current materials
 if st.session_state.raw_materials:
-    materials_df = pd.DataFrame(st.session_state.raw_materials)
-    materials_df['Annual Cost ($)'] = (materials_df['price'] * 
-                                     materials_df['consumption_rate'] * 
-                                     production_rate)
+    raw_materials = st.session_state.raw_materials
+    materials_key = (production_rate,
+                     tuple((m['name'], m['price'], m['consumption_rate']) for m in raw_materials))
+    materials_df = get_cached_table('materials', materials_key, build_materials_df,
+                                    raw_materials, production_rate)
     
     st.dataframe(
         materials_df,
@@ -141,32 +229,19 @@ if 'products' not in st.session_state:
 col1, col2 = st.columns([3, 1])
 
 with col1:
-    with st.expander("Add Product", expanded=len(st.session_state.products) == 0):
-        product_name = st.text_input("Product Name")
-        product_price = st.number_input("Selling Price ($/kg)", min_value=0.0, value=5.0, step=0.1)
-        yield_percentage = st.number_input("Yield (%)", min_value=1.0, max_value=100.0, value=90.0)
-        
-        if st.button("Add Product"):
-            if product_name:
-                st.session_state.products.append({
-                    'name': product_name,
-                    'price': product_price,
-                    'yield': yield_percentage
-                })
-                st.success(f"Added {product_name}")
-                st.rerun()
+    add_product_form()
 
 with col2:
     if st.session_state.products and st.button("🗑️ Clear All Products"):
         st.session_state.products = []
-        st.rerun()
 
 # Display current products
 if st.session_state.products:
-    products_df = pd.DataFrame(st.session_state.products)
-    products_df['Production Rate (tons/year)'] = production_rate * products_df['yield'] / 100
-    products_df['Annual Revenue ($)'] = (products_df['Production Rate (tons/year)'] * 
-                                       products_df['price'] * 1000)  # Convert tons to kg
+    products = st.session_state.products
+    products_key = (production_rate,
+                    tuple((p['name'], p['price'], p['yield']) for p in products))
+    products_df = get_cached_table('products', products_key, build_products_df,
+                                   products, production_rate)
     
     st.dataframe(
         products_df,
@@ -181,44 +256,34 @@ if st.session_state.products:
 st.header("📊 Process Summary")
 
 if st.session_state.raw_materials and st.session_state.products:
-    col1, col2, col3, col4 = st.columns(4)
+    gross_margin = ((total_revenue - total_material_cost) / total_revenue * 100) if total_revenue > 0 else 0
+    process_summary = {
+        'Production Rate': format_technical_units(production_rate, "tons/year"),
+        'Raw Material Cost': f"${total_material_cost:,.0f}/year",
+        'Revenue': f"${total_revenue:,.0f}/year",
+        'Gross Margin': f"{gross_margin:.1f}%"
+    }
     
-    with col1:
-        st.metric(
-            "Production Rate", 
-            format_technical_units(production_rate, "tons/year")
-        )
-    
-    with col2:
-        st.metric(
-            "Raw Material Cost", 
-            f"${total_material_cost:,.0f}/year"
-        )
-    
-    with col3:
-        st.metric(
-            "Revenue", 
-            f"${total_revenue:,.0f}/year"
-        )
-    
-    with col4:
-        gross_margin = ((total_revenue - total_material_cost) / total_revenue * 100) if total_revenue > 0 else 0
-        st.metric(
-            "Gross Margin", 
-            f"{gross_margin:.1f}%"
-        )
+    for col, (label, value) in zip(st.columns(len(process_summary)), process_summary.items()):
+        col.metric(label, value)
 
 # Save process data
 if st.button("💾 Save Process Data", type="primary"):
     try:
-        # Validate inputs
-        process_params = {
-            'process_type': process_type.lower(),
-            'production_rate': production_rate,
-            'operating_hours': operating_hours
-        }
-        
-        validated_params = validate_process_parameters(process_params)
+        # Validate inputs, reusing the last result when they are unchanged
+        validation_key = (process_type, production_rate, operating_hours)
+        if st.session_state.get('_last_validated_key') == validation_key:
+            validated_params = st.session_state._last_validated_params
+        else:
+            process_params = {
+                'process_type': process_type.lower(),
+                'production_rate': production_rate,
+                'operating_hours': operating_hours
+            }
+            
+            validated_params = validate_process_parameters(process_params)
+            st.session_state._last_validated_key = validation_key
+            st.session_state._last_validated_params = validated_params
         
         # Store in session state
         st.session_state.process_data = {
@@ -249,26 +314,12 @@ col1, col2 = st.columns(2)
 with col1:
     if st.button("🧪 Load Batch Reactor Template"):
         # Load predefined template
-        st.session_state.raw_materials = [
-            {'name': 'Reactant A', 'price': 2.50, 'consumption_rate': 800},
-            {'name': 'Reactant B', 'price': 1.80, 'consumption_rate': 200},
-            {'name': 'Catalyst', 'price': 50.0, 'consumption_rate': 5}
-        ]
-        st.session_state.products = [
-            {'name': 'Product X', 'price': 8.50, 'yield': 85}
-        ]
+        st.session_state.raw_materials, st.session_state.products = load_material_template('batch')
         st.success("Batch reactor template loaded!")
         st.rerun()
 
 with col2:
     if st.button("🏭 Load Continuous Process Template"):
-        st.session_state.raw_materials = [
-            {'name': 'Feedstock', 'price': 1.20, 'consumption_rate': 1050},
-            {'name': 'Solvent', 'price': 3.00, 'consumption_rate': 150}
-        ]
-        st.session_state.products = [
-            {'name': 'Main Product', 'price': 6.20, 'yield': 92},
-            {'name': 'By-product', 'price': 2.10, 'yield': 8}
-        ]
+        st.session_state.raw_materials, st.session_state.products = load_material_template('continuous')
         st.success("Continuous process template loaded!")
         st.rerun()
@@ -2,9 +2,34 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from src.economics.capital_cost import CapitalCostEstimator
+import plotly.graph_objects as go
+from src.economics.capital_cost import CapitalCostEstimator, EquipmentCosts
 from src.utils.formatters import format_currency
 import json
+import uuid
+from pathlib import Path
+
+EQUIPMENT_TYPES = ("reactor", "distillation_column", "heat_exchanger", "pump", "tank",
+                   "compressor", "mixer", "crystallizer", "dryer", "filter")
+
+# Capacity units information
+CAPACITY_UNITS = {
+    "reactor": "L (liters)",
+    "distillation_column": "theoretical plates",
+    "heat_exchanger": "m² (square meters)",
+    "pump": "L/min (liters per minute)",
+    "tank": "L (liters)",
+    "compressor": "m³/h (cubic meters per hour)",
+    "mixer": "L (liters)",
+    "crystallizer": "L (liters)",
+    "dryer": "kg/h (kilograms per hour)",
+    "filter": "m² (square meters)"
+}
+
+EQUIPMENT_COLUMNS = ('type', 'capacity', 'material', 'quantity', 'id', 'description')
+
+# Figures kept per chart; cached figures live for the whole server process
+FIGURE_CACHE_ENTRIES = 64
 
 st.set_page_config(
     page_title="Capital Costs - ChemEconAI",
@@ -18,172 +43,235 @@ st.markdown("Size and cost your process equipment to estimate total capital inve
 # Initialize capital cost estimator
 estimator = CapitalCostEstimator()
 
-# Check if process data exists
-if 'process_data' not in st.session_state or not st.session_state.process_data:
-    st.warning("⚠️ **Process data not found!**")
-    st.info("👈 Please complete the **Process Design** step first.")
-    st.stop()
+def equipment_columns_from_records(equipment_list: list) -> dict:
+    """
+    Convert a list of equipment dictionaries to column-wise storage
+    """
+    defaults = {'material': 'carbon_steel', 'quantity': 1, 'id': '', 'description': ''}
+    return {column: [eq.get(column, defaults.get(column)) for eq in equipment_list]
+            for column in EQUIPMENT_COLUMNS}
 
-process_data = st.session_state.process_data
+def bump_equipment_version():
+    """
+    Mark the equipment list as changed. The cached tables are shared across
+    sessions, so each version is a unique token rather than a per-session count
+    """
+    st.session_state.equipment_version = uuid.uuid4().hex
 
-# Display process summary
-with st.expander("📋 Process Summary", expanded=False):
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Process Type", process_data.get('type', 'Unknown'))
-        st.metric("Production Rate", f"{process_data.get('production_rate', 0):,.0f} tons/year")
-    with col2:
-        st.metric("Operating Hours", f"{process_data.get('operating_hours', 0):,.0f} hours/year")
-        st.metric("Location", process_data.get('location', 'Not specified'))
-    with col3:
-        st.metric("Raw Materials", len(process_data.get('raw_materials', [])))
-        st.metric("Products", len(process_data.get('products', [])))
+def equipment_records(equipment_cols: dict) -> list:
+    """
+    Convert column-wise equipment storage back to a list of equipment dictionaries
+    """
+    return [dict(zip(EQUIPMENT_COLUMNS, row))
+            for row in zip(*(equipment_cols[column] for column in EQUIPMENT_COLUMNS))]
 
-# Equipment Selection and Sizing
-st.header("⚙️ Equipment Selection & Sizing")
+@st.cache_data(show_spinner=False)
+def load_equipment_template(process_type: str) -> list:
+    """
+    Load the equipment list of a process template, parsed once per process type
+    """
+    template_file = Path(f"data/templates/{process_type.lower()}_process.json")
+    if not template_file.exists():
+        return []
+    
+    equipment = json.loads(template_file.read_text()).get('equipment', [])
+    # Template entries carry no IDs; number them like manually added equipment
+    for i, eq in enumerate(equipment, start=1):
+        eq.setdefault('id', f"{eq['type'].upper()}-{i:03d}")
+    return equipment
 
-# Initialize equipment list in session state
-if 'equipment_list' not in st.session_state:
-    st.session_state.equipment_list = []
+@st.cache_data(show_spinner=False)
+def build_equipment_json(equipment_version: str, _equipment_cols: dict) -> str:
+    """
+    Serialize the equipment list for export; re-serialized only when the equipment version changes
+    """
+    return json.dumps(equipment_records(_equipment_cols), indent=2)
 
-# Equipment input form
-with st.expander("➕ Add Equipment", expanded=len(st.session_state.equipment_list) == 0):
-    col1, col2 = st.columns(2)
+@st.cache_data(show_spinner=False)
+def build_equipment_display(equipment_version: str, _equipment_cols: dict) -> pd.DataFrame:
+    """
+    Build the equipment display table; rebuilt only when the equipment version changes
+    """
+    equipment_display_df = pd.DataFrame({
+        'ID': _equipment_cols['id'],
+        'Type': pd.Series(_equipment_cols['type'], dtype=object).str.replace('_', ' ').str.title(),
+        'Capacity': _equipment_cols['capacity'],
+        'Material': pd.Series(_equipment_cols['material'], dtype=object).str.replace('_', ' ').str.title(),
+        'Quantity': _equipment_cols['quantity'],
+        'Description': pd.Series(_equipment_cols['description'], dtype=object)
+    })
     
-    with col1:
-        equipment_type = st.selectbox(
-            "Equipment Type",
-            ["reactor", "distillation_column", "heat_exchanger", "pump", "tank", "compressor", "mixer", "crystallizer", "dryer", "filter"],
-            help="Select the type of equipment"
-        )
+    # Truncate long descriptions
+    long_descriptions = equipment_display_df['Description'].str.len() > 50
+    equipment_display_df.loc[long_descriptions, 'Description'] = (
+        equipment_display_df.loc[long_descriptions, 'Description'].str.slice(0, 50) + '...'
+    )
+    return equipment_display_df
+
+@st.cache_data(show_spinner=False)
+def build_equipment_cost_frame(equipment_costs: EquipmentCosts) -> pd.DataFrame:
+    """
+    Build one numeric per-equipment cost table shared by the cost table and chart
+    """
+    return pd.DataFrame({
+        'Equipment': [eq_id.replace('_', ' ').title() for eq_id in equipment_costs.equipment_ids],
+        'unit_cost': equipment_costs.unit_costs,
+        'quantity': equipment_costs.quantities,
+        'total_cost': equipment_costs.total_costs
+    })
+
+@st.cache_data(show_spinner=False)
+def build_equipment_cost_table(eq_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Format the per-equipment cost table for display
+    """
+    return pd.DataFrame({
+        'Equipment': eq_df['Equipment'],
+        'Unit Cost': eq_df['unit_cost'].map(format_currency),
+        'Quantity': eq_df['quantity'],
+        'Total Cost': eq_df['total_cost'].map(format_currency)
+    })
+
+@st.cache_data(show_spinner=False)
+def build_capital_summary(capital_breakdown: dict) -> pd.DataFrame:
+    """
+    Build the formatted capital investment summary table
+    """
+    return pd.DataFrame([
+        ['Installed Equipment Cost', format_currency(capital_breakdown['installed_equipment_cost'])],
+        ['Engineering & Design', format_currency(capital_breakdown['engineering_cost'])],
+        ['Construction & Installation', format_currency(capital_breakdown['construction_cost'])],
+        ['Contingency', format_currency(capital_breakdown['contingency'])],
+        ['Fixed Capital Investment', format_currency(capital_breakdown['fixed_capital_investment'])],
+        ['Working Capital', format_currency(capital_breakdown['working_capital'])],
+        ['**Total Capital Investment**', f"**{format_currency(capital_breakdown['total_capital_investment'])}**"]
+    ], columns=['Component', 'Cost'])
+
+@st.cache_data(show_spinner=False)
+def build_cost_breakdown_values(total_equipment_cost: float, total_installed_cost: float,
+                                capital_breakdown: dict) -> dict:
+    """
+    Build the capital cost categories shown in the breakdown chart
+    """
+    return {
+        'Equipment': total_equipment_cost,
+        'Installation': total_installed_cost - total_equipment_cost,
+        'Engineering': capital_breakdown['engineering_cost'],
+        'Construction': capital_breakdown['construction_cost'],
+        'Contingency': capital_breakdown['contingency'],
+        'Working Capital': capital_breakdown['working_capital']
+    }
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def make_cost_breakdown_pie(cost_items: tuple) -> go.Figure:
+    """
+    Build the capital cost breakdown pie chart from (category, cost) pairs
+    """
+    fig = px.pie(
+        values=[value for _, value in cost_items],
+        names=[name for name, _ in cost_items],
+        title="Capital Cost Breakdown"
+    )
+    
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def make_equipment_cost_bar(equipment_items: tuple) -> go.Figure:
+    """
+    Build the equipment cost comparison bar chart from (equipment, cost) pairs
+    """
+    eq_comp_df = pd.DataFrame(list(equipment_items), columns=['Equipment', 'Total Cost'])
+    fig = px.bar(
+        eq_comp_df,
+        x='Equipment',
+        y='Total Cost',
+        title='Equipment Cost Comparison'
+    )
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+# Editing the add form only reruns the form; adding equipment reruns the page
+@st.fragment
+def add_equipment_form(equipment_cols: dict):
+    with st.expander("➕ Add Equipment", expanded=len(equipment_cols['id']) == 0):
+        col1, col2 = st.columns(2)
         
-        capacity = st.number_input(
-            "Capacity",
-            min_value=0.1,
-            value=100.0,
-            step=10.0,
-            help="Equipment capacity (units depend on equipment type)"
-        )
+        with col1:
+            equipment_type = st.selectbox(
+                "Equipment Type",
+                EQUIPMENT_TYPES,
+                help="Select the type of equipment"
+            )
+            
+            capacity = st.number_input(
+                "Capacity",
+                min_value=0.1,
+                value=100.0,
+                step=10.0,
+                help="Equipment capacity (units depend on equipment type)"
+            )
+            
+            equipment_material = st.selectbox(
+                "Material of Construction",
+                ["carbon_steel", "stainless_steel", "hastelloy"],
+                help="Material affects cost and corrosion resistance"
+            )
         
-        equipment_material = st.selectbox(
-            "Material of Construction",
-            ["carbon_steel", "stainless_steel", "hastelloy"],
-            help="Material affects cost and corrosion resistance"
-        )
-    
-    with col2:
-        quantity = st.number_input(
-            "Quantity",
-            min_value=1,
-            max_value=20,
-            value=1,
-            help="Number of identical units"
-        )
+        with col2:
+            quantity = st.number_input(
+                "Quantity",
+                min_value=1,
+                max_value=20,
+                value=1,
+                help="Number of identical units"
+            )
+            
+            equipment_id = st.text_input(
+                "Equipment ID",
+                value=f"{equipment_type.upper()}-001",
+                help="Unique identifier for this equipment"
+            )
+            
+            description = st.text_area(
+                "Description",
+                value="",
+                help="Optional description of the equipment"
+            )
         
-        equipment_id = st.text_input(
-            "Equipment ID",
-            value=f"{equipment_type.upper()}-001",
-            help="Unique identifier for this equipment"
-        )
+        st.info(f"💡 **Capacity units for {equipment_type}:** {CAPACITY_UNITS.get(equipment_type, 'Check documentation')}")
         
-        description = st.text_area(
-            "Description",
-            value="",
-            help="Optional description of the equipment"
-        )
-    
-    # Capacity units information
-    capacity_units = {
-        "reactor": "L (liters)",
-        "distillation_column": "theoretical plates",
-        "heat_exchanger": "m² (square meters)",
-        "pump": "L/min (liters per minute)",
-        "tank": "L (liters)",
-        "compressor": "m³/h (cubic meters per hour)",
-        "mixer": "L (liters)",
-        "crystallizer": "L (liters)",
-        "dryer": "kg/h (kilograms per hour)",
-        "filter": "m² (square meters)"
-    }
-    
-    st.info(f"💡 **Capacity units for {equipment_type}:** {capacity_units.get(equipment_type, 'Check documentation')}")
-    
-    if st.button("Add Equipment", type="primary"):
-        if equipment_id and capacity > 0:
-            # Check if ID already exists
-            existing_ids = [eq.get('id', '') for eq in st.session_state.equipment_list]
-            if equipment_id in existing_ids:
-                st.error(f"Equipment ID '{equipment_id}' already exists!")
-            else:
-                st.session_state.equipment_list.append({
-                    'type': equipment_type,
-                    'capacity': capacity,
-                    'material': equipment_material,
-                    'quantity': quantity,
-                    'id': equipment_id,
-                    'description': description
-                })
-                st.success(f"✅ Added {equipment_id}")
-                st.rerun()
-        else:
-            st.error("Please provide equipment ID and valid capacity!")
-
-# Display current equipment list
-if st.session_state.equipment_list:
-    st.subheader("📋 Current Equipment List")
-    
-    # Create equipment dataframe for display
-    equipment_df_data = []
-    for i, eq in enumerate(st.session_state.equipment_list):
-        equipment_df_data.append({
-            'ID': eq['id'],
-            'Type': eq['type'].replace('_', ' ').title(),
-            'Capacity': eq['capacity'],
-            'Material': eq['material'].replace('_', ' ').title(),
-            'Quantity': eq['quantity'],
-            'Description': eq.get('description', '')[:50] + ('...' if len(eq.get('description', '')) > 50 else '')
-        })
-    
-    equipment_display_df = pd.DataFrame(equipment_df_data)
-    st.dataframe(equipment_display_df, use_container_width=True, hide_index=True)
-    
-    # Equipment management buttons
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        if st.button("🗑️ Clear All Equipment"):
-            st.session_state.equipment_list = []
-            st.rerun()
-    
-    with col2:
-        if st.button("📁 Load Template"):
-            # Load equipment from process template
-            template_file = f"data/templates/{process_data.get('type', 'batch').lower()}_process.json"
-            try:
-                with open(template_file, 'r') as f:
-                    template = json.load(f)
-                    st.session_state.equipment_list = template.get('equipment', [])
-                    st.success("Template loaded successfully!")
+        if st.button("Add Equipment", type="primary"):
+            if equipment_id and capacity > 0:
+                # Check if ID already exists
+                if equipment_id in st.session_state.equipment_ids:
+                    st.error(f"Equipment ID '{equipment_id}' already exists!")
+                else:
+                    new_equipment = {
+                        'type': equipment_type,
+                        'capacity': capacity,
+                        'material': equipment_material,
+                        'quantity': quantity,
+                        'id': equipment_id,
+                        'description': description
+                    }
+                    for column in EQUIPMENT_COLUMNS:
+                        equipment_cols[column].append(new_equipment[column])
+                    st.session_state.equipment_ids.add(equipment_id)
+                    bump_equipment_version()
+                    st.success(f"✅ Added {equipment_id}")
                     st.rerun()
-            except FileNotFoundError:
-                st.warning("Template file not found")
-    
-    with col3:
-        # Export equipment list
-        equipment_json = json.dumps(st.session_state.equipment_list, indent=2)
-        st.download_button(
-            "📥 Export Equipment List",
-            equipment_json,
-            file_name="equipment_list.json",
-            mime="application/json"
-        )
+            else:
+                st.error("Please provide equipment ID and valid capacity!")
 
-# Cost Calculation Section
-if st.session_state.equipment_list:
+# Changing the plant type only reruns the cost calculation
+@st.fragment
+def cost_calculation_section(equipment_cols: dict, process_data: dict):
     st.header("💰 Cost Calculation")
-    
+
     # Calculate equipment costs
     try:
-        equipment_costs = estimator.calculate_total_equipment_cost(st.session_state.equipment_list)
+        equipment_costs = estimator.calculate_equipment_costs_columnar(equipment_cols)
         installed_costs = estimator.calculate_installed_cost(equipment_costs)
         
         # Plant type selection for capital estimation
@@ -193,8 +281,12 @@ if st.session_state.equipment_list:
             help="Plant type affects indirect cost factors"
         )
         
+        eq_df = build_equipment_cost_frame(equipment_costs)
+        total_equipment_cost = eq_df['total_cost'].sum()
         total_installed_cost = installed_costs['total_installed_cost']
-        capital_breakdown = estimator.estimate_total_capital_investment(total_installed_cost, plant_type)
+        capital_breakdown = estimator.estimate_total_capital_investment(
+            total_installed_cost, plant_type, total_equipment_cost
+        )
         
         # Display cost breakdown
         st.subheader("📊 Cost Breakdown")
@@ -204,32 +296,12 @@ if st.session_state.equipment_list:
         
         with col1:
             st.markdown("**Equipment Costs**")
-            equipment_cost_data = []
-            for eq_id, cost_data in equipment_costs.items():
-                if eq_id != 'total_equipment_cost':
-                    if isinstance(cost_data, dict):
-                        equipment_cost_data.append({
-                            'Equipment': eq_id.replace('_', ' ').title(),
-                            'Unit Cost': format_currency(cost_data['unit_cost']),
-                            'Quantity': cost_data['quantity'],
-                            'Total Cost': format_currency(cost_data['total_cost'])
-                        })
-            
-            if equipment_cost_data:
-                eq_cost_df = pd.DataFrame(equipment_cost_data)
-                st.dataframe(eq_cost_df, use_container_width=True, hide_index=True)
+            if not eq_df.empty:
+                st.dataframe(build_equipment_cost_table(eq_df), use_container_width=True, hide_index=True)
         
         with col2:
             st.markdown("**Capital Investment Summary**")
-            capital_summary = pd.DataFrame([
-                ['Installed Equipment Cost', format_currency(capital_breakdown['installed_equipment_cost'])],
-                ['Engineering & Design', format_currency(capital_breakdown['engineering_cost'])],
-                ['Construction & Installation', format_currency(capital_breakdown['construction_cost'])],
-                ['Contingency', format_currency(capital_breakdown['contingency'])],
-                ['Fixed Capital Investment', format_currency(capital_breakdown['fixed_capital_investment'])],
-                ['Working Capital', format_currency(capital_breakdown['working_capital'])],
-                ['**Total Capital Investment**', f"**{format_currency(capital_breakdown['total_capital_investment'])}**"]
-            ], columns=['Component', 'Cost'])
+            capital_summary = build_capital_summary(capital_breakdown)
             
             st.dataframe(capital_summary, use_container_width=True, hide_index=True)
         
@@ -251,61 +323,34 @@ if st.session_state.equipment_list:
             )
         
         with col3:
-            equipment_fraction = (equipment_costs['total_equipment_cost'] / capital_breakdown['total_capital_investment']) * 100
             st.metric(
                 "Equipment Cost Fraction",
-                f"{equipment_fraction:.1f}%"
+                f"{capital_breakdown['equipment_fraction']:.1f}%"
             )
         
         with col4:
-            installed_factor = total_installed_cost / equipment_costs['total_equipment_cost']
             st.metric(
                 "Installation Factor",
-                f"{installed_factor:.1f}x"
+                f"{capital_breakdown['installation_factor']:.1f}x"
             )
         
         # Capital cost visualization
         st.subheader("📊 Cost Visualization")
         
         # Pie chart of capital cost breakdown
-        cost_breakdown_data = {
-            'Equipment': equipment_costs['total_equipment_cost'],
-            'Installation': total_installed_cost - equipment_costs['total_equipment_cost'],
-            'Engineering': capital_breakdown['engineering_cost'],
-            'Construction': capital_breakdown['construction_cost'],
-            'Contingency': capital_breakdown['contingency'],
-            'Working Capital': capital_breakdown['working_capital']
-        }
-        
-        fig = px.pie(
-            values=list(cost_breakdown_data.values()),
-            names=list(cost_breakdown_data.keys()),
-            title="Capital Cost Breakdown"
+        cost_breakdown_data = build_cost_breakdown_values(
+            total_equipment_cost,
+            total_installed_cost,
+            capital_breakdown
         )
         
-        fig.update_traces(textposition='inside', textinfo='percent+label')
+        fig = make_cost_breakdown_pie(tuple(cost_breakdown_data.items()))
         st.plotly_chart(fig, use_container_width=True)
         
         # Equipment cost comparison
-        if len(st.session_state.equipment_list) > 1:
-            equipment_comparison_data = []
-            for eq_id, cost_data in equipment_costs.items():
-                if eq_id != 'total_equipment_cost' and isinstance(cost_data, dict):
-                    equipment_comparison_data.append({
-                        'Equipment': eq_id.replace('_', ' ').title(),
-                        'Total Cost': cost_data['total_cost']
-                    })
-            
-            if equipment_comparison_data:
-                eq_comp_df = pd.DataFrame(equipment_comparison_data)
-                fig2 = px.bar(
-                    eq_comp_df,
-                    x='Equipment',
-                    y='Total Cost',
-                    title='Equipment Cost Comparison'
-                )
-                fig2.update_layout(xaxis_tickangle=-45)
-                st.plotly_chart(fig2, use_container_width=True)
+        if len(equipment_cols['id']) > 1 and not eq_df.empty:
+            fig2 = make_equipment_cost_bar(tuple(zip(eq_df['Equipment'], eq_df['total_cost'])))
+            st.plotly_chart(fig2, use_container_width=True)
         
         # Save capital costs to session state
         st.session_state.capital_costs = capital_breakdown
@@ -319,6 +364,86 @@ if st.session_state.equipment_list:
     except Exception as e:
         st.error(f"❌ Error calculating costs: {str(e)}")
 
+# Check if process data exists
+if 'process_data' not in st.session_state or not st.session_state.process_data:
+    st.warning("⚠️ **Process data not found!**")
+    st.info("👈 Please complete the **Process Design** step first.")
+    st.stop()
+
+process_data = st.session_state.process_data
+
+# Display process summary
+with st.expander("📋 Process Summary", expanded=False):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Process Type", process_data.get('type', 'Unknown'))
+        st.metric("Production Rate", f"{process_data.get('production_rate', 0):,.0f} tons/year")
+    with col2:
+        st.metric("Operating Hours", f"{process_data.get('operating_hours', 0):,.0f} hours/year")
+        st.metric("Location", process_data.get('location', 'Not specified'))
+    with col3:
+        st.metric("Raw Materials", len(process_data.get('raw_materials', [])))
+        st.metric("Products", len(process_data.get('products', [])))
+
+# Equipment Selection and Sizing
+st.header("⚙️ Equipment Selection & Sizing")
+
+# Initialize column-wise equipment storage in session state
+if 'equipment_cols' not in st.session_state:
+    st.session_state.equipment_cols = equipment_columns_from_records([])
+if 'equipment_ids' not in st.session_state:
+    st.session_state.equipment_ids = set(st.session_state.equipment_cols['id'])
+if 'equipment_version' not in st.session_state:
+    bump_equipment_version()
+
+equipment_cols = st.session_state.equipment_cols
+
+# Equipment input form
+add_equipment_form(equipment_cols)
+
+# Display current equipment list
+if equipment_cols['id']:
+    st.subheader("📋 Current Equipment List")
+    
+    # Create equipment dataframe for display
+    equipment_display_df = build_equipment_display(st.session_state.equipment_version, equipment_cols)
+    st.dataframe(equipment_display_df, use_container_width=True, hide_index=True)
+    
+    # Equipment management buttons
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("🗑️ Clear All Equipment"):
+            st.session_state.equipment_cols = equipment_columns_from_records([])
+            st.session_state.equipment_ids = set()
+            bump_equipment_version()
+            st.rerun()
+    
+    with col2:
+        if st.button("📁 Load Template"):
+            # Load equipment from process template
+            template_equipment = load_equipment_template(process_data.get('type', 'batch'))
+            if template_equipment:
+                st.session_state.equipment_cols = equipment_columns_from_records(template_equipment)
+                st.session_state.equipment_ids = set(st.session_state.equipment_cols['id'])
+                bump_equipment_version()
+                st.success("Template loaded successfully!")
+                st.rerun()
+            else:
+                st.warning("Template file not found")
+    
+    with col3:
+        # Export equipment list
+        equipment_json = build_equipment_json(st.session_state.equipment_version, equipment_cols)
+        st.download_button(
+            "📥 Export Equipment List",
+            equipment_json,
+            file_name="equipment_list.json",
+            mime="application/json"
+        )
+
+# Cost Calculation Section
+if equipment_cols['id']:
+    cost_calculation_section(equipment_cols, process_data)
 else:
     st.info("➕ Add equipment to calculate capital costs")
 
@@ -1,8 +1,6 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import numpy as np
 from src.economics.profitability import ProfitabilityAnalyzer
 from src.utils.formatters import format_currency, format_percentage
@@ -70,79 +68,128 @@ else:
     annual_operating_costs = st.session_state.operating_costs.get('total_annual_operating_cost', 0)
     capital_investment = st.session_state.capital_costs.get('total_capital_investment', 0)
 
-# Initialize profitability analyzer
-analyzer = ProfitabilityAnalyzer()
+# Decision scoring: weights of the NPV, IRR and payback checks, the
+# profitability index rating per level, and the recommendation per score band
+DECISION_WEIGHTS = np.array([3, 3, 2])
+PI_RATINGS = (
+    "❌ Poor Profitability Index",
+    "✅ Acceptable Profitability Index",
+    "✅ Strong Profitability Index"
+)
+DECISION_THRESHOLDS = np.array([5, 8])
+DECISION_RECOMMENDATIONS = (
+    ("🔴 **RECOMMENDATION: REJECT**", "inverse"),
+    ("🟡 **CONDITIONAL APPROVAL** (with risk mitigation)", "normal"),
+    ("🟢 **STRONG RECOMMENDATION: APPROVE**", "normal")
+)
 
-# Financial Parameters Input
-st.header("💼 Financial Parameters")
+@st.cache_resource(show_spinner=False)
+def get_analyzer() -> ProfitabilityAnalyzer:
+    """
+    Share one profitability analyzer across reruns
+    """
+    return ProfitabilityAnalyzer()
 
-col1, col2, col3 = st.columns(3)
+@st.cache_data(show_spinner=False)
+def compute_profitability(capital_investment: float, annual_revenue: float,
+                          annual_operating_costs: float, project_lifetime: int,
+                          discount_rate: float, tax_rate: float, salvage_value: float) -> dict:
+    """
+    Run the profitability analysis once per set of financial inputs
+    """
+    return get_analyzer().analyze_profitability(
+        capital_investment=capital_investment,
+        annual_revenue=annual_revenue,
+        annual_operating_costs=annual_operating_costs,
+        project_lifetime=project_lifetime,
+        discount_rate=discount_rate,
+        tax_rate=tax_rate,
+        salvage_value=salvage_value
+    )
 
-with col1:
-    st.subheader("Project Parameters")
-    project_lifetime = st.number_input(
-        "Project Lifetime (years)",
-        min_value=5,
-        max_value=50,
-        value=20,
-        help="Economic life of the project"
+@st.cache_data(show_spinner=False)
+def compute_sensitivity(base_items: tuple, sensitivity_items: tuple) -> pd.DataFrame:
+    """
+    Run the sensitivity analysis once per base case and parameter ranges
+    """
+    return get_analyzer().sensitivity_analysis(
+        dict(base_items),
+        {param: list(changes) for param, changes in sensitivity_items}
     )
-    
-    discount_rate = st.number_input(
-        "Discount Rate (%)",
-        min_value=5.0,
-        max_value=25.0,
-        value=12.0,
-        step=0.5,
-        help="Required rate of return (WACC)"
-    ) / 100
-    
-    tax_rate = st.number_input(
-        "Tax Rate (%)",
-        min_value=0.0,
-        max_value=50.0,
-        value=30.0,
-        step=1.0,
-        help="Corporate tax rate"
-    ) / 100
 
-with col2:
-    st.subheader("Current Values")
-    st.metric("Annual Revenue", format_currency(annual_revenue))
-    st.metric("Annual Operating Costs", format_currency(annual_operating_costs))
-    st.metric("Capital Investment", format_currency(capital_investment))
-    
-    gross_profit = annual_revenue - annual_operating_costs
-    st.metric("Gross Annual Profit", format_currency(gross_profit))
+# Financial Parameters Input
+st.header("💼 Financial Parameters")
 
-with col3:
-    st.subheader("Additional Parameters")
-    salvage_value_percent = st.number_input(
-        "Salvage Value (% of CAPEX)",
-        min_value=0.0,
-        max_value=20.0,
-        value=10.0,
-        help="Equipment value at end of project life"
-    )
+with st.form("profitability_params"):
+    col1, col2, col3 = st.columns(3)
     
-    salvage_value = capital_investment * (salvage_value_percent / 100)
+    with col1:
+        st.subheader("Project Parameters")
+        project_lifetime = st.number_input(
+            "Project Lifetime (years)",
+            min_value=5,
+            max_value=50,
+            value=20,
+            help="Economic life of the project"
+        )
+        
+        discount_rate = st.number_input(
+            "Discount Rate (%)",
+            min_value=5.0,
+            max_value=25.0,
+            value=12.0,
+            step=0.5,
+            help="Required rate of return (WACC)"
+        ) / 100
+        
+        tax_rate = st.number_input(
+            "Tax Rate (%)",
+            min_value=0.0,
+            max_value=50.0,
+            value=30.0,
+            step=1.0,
+            help="Corporate tax rate"
+        ) / 100
     
-    working_capital_recovery = st.checkbox(
-        "Recover Working Capital",
-        value=True,
-        help="Recover working capital at end of project"
-    )
+    with col2:
+        st.subheader("Current Values")
+        st.metric("Annual Revenue", format_currency(annual_revenue))
+        st.metric("Annual Operating Costs", format_currency(annual_operating_costs))
+        st.metric("Capital Investment", format_currency(capital_investment))
+        
+        gross_profit = annual_revenue - annual_operating_costs
+        st.metric("Gross Annual Profit", format_currency(gross_profit))
     
-    inflation_rate = st.number_input(
-        "Inflation Rate (%)",
-        min_value=0.0,
-        max_value=10.0,
-        value=2.5,
-        help="Annual inflation rate for costs/revenues"
-    ) / 100
+    with col3:
+        st.subheader("Additional Parameters")
+        salvage_value_percent = st.number_input(
+            "Salvage Value (% of CAPEX)",
+            min_value=0.0,
+            max_value=20.0,
+            value=10.0,
+            help="Equipment value at end of project life"
+        )
+        
+        salvage_value = capital_investment * (salvage_value_percent / 100)
+        
+        working_capital_recovery = st.checkbox(
+            "Recover Working Capital",
+            value=True,
+            help="Recover working capital at end of project"
+        )
+        
+        inflation_rate = st.number_input(
+            "Inflation Rate (%)",
+            min_value=0.0,
+            max_value=10.0,
+            value=2.5,
+            help="Annual inflation rate for costs/revenues"
+        ) / 100
+    
+    submitted = st.form_submit_button("🚀 Calculate Profitability", type="primary")
 
 # Calculate Profitability
-if st.button("🚀 Calculate Profitability", type="primary"):
+if submitted:
     try:
         # Validate inputs
         economic_inputs = {
@@ -154,14 +201,14 @@ if st.button("🚀 Calculate Profitability", type="primary"):
         validated_inputs = validate_economic_inputs(economic_inputs)
         
         # Perform profitability analysis
-        results = analyzer.analyze_profitability(
-            capital_investment=capital_investment,
-            annual_revenue=annual_revenue,
-            annual_operating_costs=annual_operating_costs,
-            project_lifetime=project_lifetime,
-            discount_rate=discount_rate,
-            tax_rate=tax_rate,
-            salvage_value=salvage_value
+        results = compute_profitability(
+            capital_investment,
+            annual_revenue,
+            annual_operating_costs,
+            project_lifetime,
+            discount_rate,
+            tax_rate,
+            salvage_value
         )
         
         # Store results in session state
@@ -233,46 +280,30 @@ if st.button("🚀 Calculate Profitability", type="primary"):
         # Investment Decision
         st.subheader("🎯 Investment Decision")
         
-        decision_score = 0
-        decision_factors = []
-        
-        if results['npv'] > 0:
-            decision_score += 3
-            decision_factors.append("✅ Positive NPV")
-        else:
-            decision_factors.append("❌ Negative NPV")
-        
-        if results['irr'] > discount_rate * 100:
-            decision_score += 3
-            decision_factors.append(f"✅ IRR ({results['irr']:.1f}%) > Required Return ({discount_rate*100:.1f}%)")
-        else:
-            decision_factors.append(f"❌ IRR ({results['irr']:.1f}%) < Required Return ({discount_rate*100:.1f}%)")
-        
-        if results['payback_period'] < project_lifetime / 2:
-            decision_score += 2
-            decision_factors.append(f"✅ Reasonable Payback Period ({results['payback_period']:.1f} years)")
-        else:
-            decision_factors.append(f"⚠️ Long Payback Period ({results['payback_period']:.1f} years)")
-        
-        if results['profitability_index'] > 1.2:
-            decision_score += 2
-            decision_factors.append(f"✅ Strong Profitability Index ({results['profitability_index']:.2f})")
-        elif results['profitability_index'] > 1.0:
-            decision_score += 1
-            decision_factors.append(f"✅ Acceptable Profitability Index ({results['profitability_index']:.2f})")
-        else:
-            decision_factors.append(f"❌ Poor Profitability Index ({results['profitability_index']:.2f})")
+        # NPV, IRR and payback checks pass or fail; the profitability index
+        # scores 0/1/2 for poor/acceptable/strong
+        pi = results['profitability_index']
+        passed = tuple(map(bool, (
+            results['npv'] > 0,
+            results['irr'] > discount_rate * 100,
+            results['payback_period'] < project_lifetime / 2
+        )))
+        pi_level = int(pi > 1.0) + int(pi > 1.2)
+        decision_score = int(np.dot(passed, DECISION_WEIGHTS)) + pi_level
+        
+        irr_comparison = f"({results['irr']:.1f}%) {'>' if passed[1] else '<'} Required Return ({discount_rate*100:.1f}%)"
+        decision_factors = [
+            ("❌ Negative NPV", "✅ Positive NPV")[passed[0]],
+            f"{('❌', '✅')[passed[1]]} IRR {irr_comparison}",
+            (f"⚠️ Long Payback Period ({results['payback_period']:.1f} years)",
+             f"✅ Reasonable Payback Period ({results['payback_period']:.1f} years)")[passed[2]],
+            f"{PI_RATINGS[pi_level]} ({pi:.2f})"
+        ]
         
         # Decision recommendation
-        if decision_score >= 8:
-            decision = "🟢 **STRONG RECOMMENDATION: APPROVE**"
-            decision_color = "normal"
-        elif decision_score >= 5:
-            decision = "🟡 **CONDITIONAL APPROVAL** (with risk mitigation)"
-            decision_color = "normal"
-        else:
-            decision = "🔴 **RECOMMENDATION: REJECT**"
-            decision_color = "inverse"
+        decision, decision_color = DECISION_RECOMMENDATIONS[
+            int(np.searchsorted(DECISION_THRESHOLDS, decision_score, side='right'))
+        ]
         
         st.markdown(f"### {decision}")
         
@@ -283,40 +314,39 @@ if st.button("🚀 Calculate Profitability", type="primary"):
         st.subheader("💰 Cash Flow Analysis")
         
         # Create cash flow projection
-        years = list(range(0, project_lifetime + 1))
-        cash_flows = [-capital_investment]  # Initial investment
+        years = np.arange(project_lifetime + 1, dtype=np.int32)
+        cash_flows = np.full(project_lifetime + 1, results['annual_cash_flow'], dtype=np.float64)
+        cash_flows[0] = -capital_investment  # Initial investment
         
-        for year in range(1, project_lifetime + 1):
-            # Apply inflation
-            inflated_revenue = annual_revenue * (1 + inflation_rate) ** (year - 1)
-            inflated_costs = annual_operating_costs * (1 + inflation_rate) ** (year - 1)
-            
-            annual_cf = results['annual_cash_flow']
-            if year == project_lifetime and working_capital_recovery:
-                annual_cf += st.session_state.capital_costs.get('working_capital', 0)
-            
-            cash_flows.append(annual_cf)
+        if working_capital_recovery:
+            cash_flows[-1] += st.session_state.get('capital_costs', {}).get('working_capital', 0)
+        
+        cumulative_cash_flows = np.cumsum(cash_flows)
         
         # Create cash flow dataframe
         cf_df = pd.DataFrame({
             'Year': years,
             'Cash Flow': cash_flows,
-            'Cumulative Cash Flow': np.cumsum(cash_flows)
+            'Cumulative Cash Flow': cumulative_cash_flows,
+            'Cash Flow ($M)': cash_flows / 1e6,
+            'Cumulative CF ($M)': cumulative_cash_flows / 1e6
         })
         
-        # Cash flow chart
+        # Cash flow chart; Plotly is only imported once there is something to plot
+        import plotly.graph_objects as go
+        
         fig = go.Figure()
         
         fig.add_trace(go.Bar(
-            x=cf_df['Year'],
-            y=cf_df['Cash Flow'],
+            x=years,
+            y=cash_flows,
             name='Annual Cash Flow',
-            marker_color=['red' if x < 0 else 'green' for x in cf_df['Cash Flow']]
+            marker_color=np.where(cash_flows < 0, 'red', 'green')
         ))
         
         fig.add_trace(go.Scatter(
-            x=cf_df['Year'],
-            y=cf_df['Cumulative Cash Flow'],
+            x=years,
+            y=cumulative_cash_flows,
             mode='lines+markers',
             name='Cumulative Cash Flow',
             line=dict(color='blue', width=3),
@@ -338,9 +368,6 @@ if st.button("🚀 Calculate Profitability", type="primary"):
         st.plotly_chart(fig, use_container_width=True)
         
         # Cash flow table
-        cf_df['Cash Flow ($M)'] = cf_df['Cash Flow'] / 1e6
-        cf_df['Cumulative CF ($M)'] = cf_df['Cumulative Cash Flow'] / 1e6
-        
         st.dataframe(
             cf_df[['Year', 'Cash Flow ($M)', 'Cumulative CF ($M)']].round(2),
             use_container_width=True,
@@ -357,9 +384,9 @@ if st.button("🚀 Calculate Profitability", type="primary"):
         )
         
         if sensitivity_params and st.button("Run Sensitivity Analysis"):
-            sensitivity_ranges = {}
-            for param in sensitivity_params:
-                sensitivity_ranges[param] = [-20, -10, -5, 0, 5, 10, 20]
+            sensitivity_ranges = tuple(
+                (param, (-20, -10, -5, 0, 5, 10, 20)) for param in sensitivity_params
+            )
             
             base_parameters = {
                 'capital_investment': capital_investment,
@@ -371,9 +398,11 @@ if st.button("🚀 Calculate Profitability", type="primary"):
                 'salvage_value': salvage_value
             }
             
-            sensitivity_results = analyzer.sensitivity_analysis(base_parameters, sensitivity_ranges)
+            sensitivity_results = compute_sensitivity(tuple(base_parameters.items()), sensitivity_ranges)
             
             # Plot sensitivity results
+            import plotly.express as px
+            
             fig_sens = px.line(
                 sensitivity_results,
                 x='change_percent',
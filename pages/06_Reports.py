@@ -1,15 +1,10 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
-import json
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
 import io
+import orjson
+from collections import defaultdict
 
 st.set_page_config(
     page_title="Reports - ChemEconAI",
@@ -20,6 +15,242 @@ st.set_page_config(
 st.title("📋 Executive Reports & Documentation")
 st.markdown("Generate comprehensive reports for your chemical process economics analysis.")
 
+# Report section templates, filled with str.format_map; missing metrics read as 0
+EXECUTIVE_SUMMARY_TEMPLATE = """
+## Executive Summary
+
+**Project:** {project_name}
+**Analysis Date:** {report_date}
+**Analyst:** {author_name}
+
+### Key Financial Metrics
+- **Net Present Value (NPV):** ${npv:,.2f}
+- **Internal Rate of Return (IRR):** {irr:.1f}%
+- **Payback Period:** {payback_period:.1f} years
+- **Return on Investment (ROI):** {roi:.1f}%
+
+### Investment Recommendation
+{recommendation}"""
+
+PROCESS_OVERVIEW_TEMPLATE = """
+## Process Overview
+
+**Process Type:** {type}
+**Production Capacity:** {production_rate:,.0f} tons/year
+**Operating Hours:** {operating_hours:,.0f} hours/year
+**Plant Location:** {location}
+
+### Raw Materials
+"""
+
+CAPITAL_ANALYSIS_TEMPLATE = """
+## Capital Cost Analysis
+
+### Total Capital Investment: ${total_capital_investment:,.2f}
+
+**Cost Breakdown:**
+- **Installed Equipment Cost:** ${installed_equipment_cost:,.2f}
+- **Engineering & Design:** ${engineering_cost:,.2f}
+- **Construction:** ${construction_cost:,.2f}
+- **Contingency:** ${contingency:,.2f}
+- **Working Capital:** ${working_capital:,.2f}
+
+### Key Metrics
+- **CAPEX per Annual Ton:** ${capex_per_ton:,.2f}
+- **Fixed Capital Investment:** ${fixed_capital_investment:,.2f}
+"""
+
+OPERATING_ANALYSIS_TEMPLATE = """
+## Operating Cost Analysis
+
+### Total Annual Operating Cost: ${total_annual_operating_cost:,.2f}
+
+**Cost Breakdown:**
+- **Raw Materials:** ${total_raw_material_cost:,.2f}
+- **Utilities:** ${total_utility_cost:,.2f}
+- **Labor:** ${total_labor_cost:,.2f}
+- **Maintenance:** ${maintenance_cost:,.2f}
+- **Overhead:** ${total_overhead_cost:,.2f}
+
+### Operating Cost per Ton Product
+${opex_per_ton:,.2f} per ton
+"""
+
+PROFITABILITY_ANALYSIS_TEMPLATE = """
+## Profitability Analysis
+
+### Financial Metrics
+- **Net Present Value:** ${npv:,.2f}
+- **Internal Rate of Return:** {irr:.1f}%
+- **Payback Period:** {payback_period:.1f} years
+- **Profitability Index:** {profitability_index:.2f}
+- **Return on Investment:** {roi:.1f}%
+
+### Annual Cash Flow
+**Average Annual Cash Flow:** ${annual_cash_flow:,.2f}
+
+### Project Economics Summary
+- **Total Project Revenue:** ${total_revenue:,.2f}
+- **Total Project Costs:** ${total_costs:,.2f}
+- **Net Project Value:** ${net_project_value:,.2f}
+"""
+
+RECOMMENDATIONS_TEXT = """
+## Recommendations
+
+### Strategic Recommendations
+1. **Process Optimization:** Focus on improving yield and reducing raw material consumption
+2. **Cost Control:** Implement cost monitoring systems for key expense categories
+3. **Risk Management:** Develop contingency plans for market volatility
+4. **Technology:** Consider process intensification opportunities
+
+### Next Steps
+1. Detailed engineering design
+2. Vendor quotations for major equipment
+3. Environmental and safety assessments
+4. Financing arrangements
+5. Project implementation planning
+
+### Risk Mitigation
+- Secure long-term supply contracts for key raw materials
+- Consider product price hedging strategies
+- Plan for regulatory compliance requirements
+- Implement robust process control systems
+"""
+
+# Capital breakdown pie: (category, capital cost key)
+CAPITAL_BREAKDOWN_ITEMS = (
+    ('Equipment', 'installed_equipment_cost'),
+    ('Engineering', 'engineering_cost'),
+    ('Construction', 'construction_cost'),
+    ('Contingency', 'contingency'),
+    ('Working Capital', 'working_capital')
+)
+
+# Markdown markers dropped from section text in the PDF
+MARKDOWN_STRIP = str.maketrans('', '', '#*`')
+
+# Figures kept per chart; cached figures live for the whole server process
+FIGURE_CACHE_ENTRIES = 64
+
+@st.cache_resource(show_spinner=False)
+def get_pdf_styles():
+    """
+    Build the ReportLab sample stylesheet and report title style once per server process
+    """
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+    
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        textColor=colors.HexColor('#1f77b4'),
+        spaceAfter=30
+    )
+    return styles, title_style
+
+@st.cache_data(show_spinner=False)
+def build_pdf_report(report_title: str, sections: tuple) -> bytes:
+    """
+    Render (section name, markdown) pairs to PDF; rebuilt only when the title or content changes
+    """
+    # ReportLab is only needed once a PDF is actually exported
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    styles, title_style = get_pdf_styles()
+    story = []
+    
+    # Title
+    story.append(Paragraph(report_title, title_style))
+    story.append(Spacer(1, 12))
+    
+    # Add content
+    for section_name, section_content in sections:
+        # Section header
+        story.append(Paragraph(section_name, styles['Heading2']))
+        story.append(Spacer(1, 12))
+        
+        # Section content (simplified for PDF)
+        content = section_content.translate(MARKDOWN_STRIP)
+        lines = (line.strip() for line in content.split('\n'))
+        story.extend(Paragraph(line, styles['Normal']) for line in lines if line)
+        story.append(Spacer(1, 6))
+    
+    # Build PDF
+    doc.build(story)
+    
+    pdf_data = buffer.getvalue()
+    buffer.close()
+    return pdf_data
+
+@st.cache_data(show_spinner=False)
+def build_excel_report(sheets: tuple) -> bytes:
+    """
+    Write (sheet name, DataFrame) pairs to an in-memory workbook; rewritten only when the sheets change
+    """
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        for sheet_name, sheet_df in sheets:
+            sheet_df.to_excel(writer, sheet_name=sheet_name, index=False)
+    return buffer.getvalue()
+
+def build_sheet_frame(values: dict, value_column: str, label_column: str = 'Item') -> pd.DataFrame:
+    """
+    Build a two-column export sheet from an ordered label -> value dict
+    """
+    return (pd.DataFrame.from_dict(values, orient='index', columns=[value_column])
+            .rename_axis(label_column)
+            .reset_index())
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def make_metrics_benchmark_bar(metric_values: tuple) -> go.Figure:
+    """
+    Build the project vs industry benchmark bar chart once per set of metric values
+    """
+    metrics = ['NPV ($M)', 'IRR (%)', 'Payback (years)', 'ROI (%)']
+    benchmarks = [5, 15, 5, 20]  # Industry benchmarks
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name='Project',
+        x=metrics,
+        y=list(metric_values),
+        marker_color='#1f77b4'
+    ))
+    fig.add_trace(go.Bar(
+        name='Industry Benchmark',
+        x=metrics,
+        y=benchmarks,
+        marker_color='#ff7f0e',
+        opacity=0.7
+    ))
+    
+    fig.update_layout(
+        title='Financial Metrics vs Industry Benchmarks',
+        barmode='group',
+        yaxis_title='Value'
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def make_capital_breakdown_pie(cost_items: tuple) -> go.Figure:
+    """
+    Build the capital cost breakdown pie once per set of (category, cost) pairs
+    """
+    import plotly.express as px
+    
+    names, values = zip(*cost_items)
+    return px.pie(
+        values=values,
+        names=names,
+        title='Capital Cost Breakdown'
+    )
+
 # Check for required data
 required_data = {
     'Process Design': 'process_data',
@@ -100,161 +331,87 @@ report_sections = st.multiselect(
 
 # Report Preview
 if st.button("🔍 Generate Report Preview", type="primary"):
+    # Keep the preview and its export buttons across the reruns those buttons trigger
+    st.session_state.report_preview = True
+
+if st.session_state.get('report_preview'):
     
     # Create report content
     report_content = {}
     
     # Executive Summary
-    if "Executive Summary" in report_sections and 'calculations' in available_data:
+    if "Executive Summary" in report_sections and 'Profitability Analysis' in available_data:
         calculations = available_data['Profitability Analysis']
         
-        executive_summary = f"""
-        ## Executive Summary
-        
-        **Project:** {project_name}
-        **Analysis Date:** {report_date}
-        **Analyst:** {author_name}
-        
-        ### Key Financial Metrics
-        - **Net Present Value (NPV):** ${calculations.get('npv', 0):,.2f}
-        - **Internal Rate of Return (IRR):** {calculations.get('irr', 0):.1f}%
-        - **Payback Period:** {calculations.get('payback_period', 0):.1f} years
-        - **Return on Investment (ROI):** {calculations.get('roi', 0):.1f}%
-        
-        ### Investment Recommendation
-        """
-        
         if calculations.get('npv', 0) > 0 and calculations.get('irr', 0) > 12:
-            executive_summary += "✅ **RECOMMENDATION: APPROVE** - The project shows strong financial returns with positive NPV and acceptable IRR."
+            recommendation = "✅ **RECOMMENDATION: APPROVE** - The project shows strong financial returns with positive NPV and acceptable IRR."
         elif calculations.get('npv', 0) > 0:
-            executive_summary += "🟡 **CONDITIONAL APPROVAL** - Positive NPV but consider risk factors."
+            recommendation = "🟡 **CONDITIONAL APPROVAL** - Positive NPV but consider risk factors."
         else:
-            executive_summary += "❌ **NOT RECOMMENDED** - Negative NPV indicates poor financial returns."
-        
-        report_content['Executive Summary'] = executive_summary
+            recommendation = "❌ **NOT RECOMMENDED** - Negative NPV indicates poor financial returns."
+        
+        report_content['Executive Summary'] = EXECUTIVE_SUMMARY_TEMPLATE.format_map(defaultdict(
+            int, calculations,
+            project_name=project_name,
+            report_date=report_date,
+            author_name=author_name,
+            recommendation=recommendation
+        ))
     
     # Process Overview
     if "Process Overview" in report_sections and 'Process Design' in available_data:
         process_data = available_data['Process Design']
         
-        process_overview = f"""
-        ## Process Overview
-        
-        **Process Type:** {process_data.get('type', 'Not specified')}
-        **Production Capacity:** {process_data.get('production_rate', 0):,.0f} tons/year
-        **Operating Hours:** {process_data.get('operating_hours', 0):,.0f} hours/year
-        **Plant Location:** {process_data.get('location', 'Not specified')}
-        
-        ### Raw Materials
-        """
-        
-        if 'raw_materials' in process_data:
-            for material in process_data['raw_materials']:
-                process_overview += f"- **{material['name']}:** ${material['price']:.2f}/kg, {material['consumption_rate']} kg/ton product\n"
+        overview_parts = [PROCESS_OVERVIEW_TEMPLATE.format_map(defaultdict(
+            int, process_data,
+            type=process_data.get('type', 'Not specified'),
+            location=process_data.get('location', 'Not specified')
+        ))]
+        overview_parts.extend(
+            f"- **{material['name']}:** ${material['price']:.2f}/kg, {material['consumption_rate']} kg/ton product\n"
+            for material in process_data.get('raw_materials', [])
+        )
         
-        process_overview += "\n### Products\n"
-        if 'products' in process_data:
-            for product in process_data['products']:
-                process_overview += f"- **{product['name']}:** ${product['price']:.2f}/kg, {product['yield']}% yield\n"
+        overview_parts.append("\n### Products\n")
+        overview_parts.extend(
+            f"- **{product['name']}:** ${product['price']:.2f}/kg, {product['yield']}% yield\n"
+            for product in process_data.get('products', [])
+        )
         
-        report_content['Process Overview'] = process_overview
+        report_content['Process Overview'] = "".join(overview_parts)
+    
+    production_rate = st.session_state.get('process_data', {}).get('production_rate', 1) or 1
     
     # Capital Cost Analysis
     if "Capital Cost Analysis" in report_sections and 'Capital Costs' in available_data:
         capital_data = available_data['Capital Costs']
         
-        capital_analysis = f"""
-        ## Capital Cost Analysis
-        
-        ### Total Capital Investment: ${capital_data.get('total_capital_investment', 0):,.2f}
-        
-        **Cost Breakdown:**
-        - **Installed Equipment Cost:** ${capital_data.get('installed_equipment_cost', 0):,.2f}
-        - **Engineering & Design:** ${capital_data.get('engineering_cost', 0):,.2f}
-        - **Construction:** ${capital_data.get('construction_cost', 0):,.2f}
-        - **Contingency:** ${capital_data.get('contingency', 0):,.2f}
-        - **Working Capital:** ${capital_data.get('working_capital', 0):,.2f}
-        
-        ### Key Metrics
-        - **CAPEX per Annual Ton:** ${(capital_data.get('total_capital_investment', 0) / st.session_state.get('process_data', {}).get('production_rate', 1)):,.2f}
-        - **Fixed Capital Investment:** ${capital_data.get('fixed_capital_investment', 0):,.2f}
-        """
-        
-        report_content['Capital Cost Analysis'] = capital_analysis
+        report_content['Capital Cost Analysis'] = CAPITAL_ANALYSIS_TEMPLATE.format_map(defaultdict(
+            int, capital_data,
+            capex_per_ton=capital_data.get('total_capital_investment', 0) / production_rate
+        ))
     
     # Operating Cost Analysis
     if "Operating Cost Analysis" in report_sections and 'Operating Costs' in available_data:
         operating_data = available_data['Operating Costs']
         
-        operating_analysis = f"""
-        ## Operating Cost Analysis
-        
-        ### Total Annual Operating Cost: ${operating_data.get('total_annual_operating_cost', 0):,.2f}
-        
-        **Cost Breakdown:**
-        - **Raw Materials:** ${operating_data.get('total_raw_material_cost', 0):,.2f}
-        - **Utilities:** ${operating_data.get('total_utility_cost', 0):,.2f}
-        - **Labor:** ${operating_data.get('total_labor_cost', 0):,.2f}
-        - **Maintenance:** ${operating_data.get('maintenance_cost', 0):,.2f}
-        - **Overhead:** ${operating_data.get('total_overhead_cost', 0):,.2f}
-        
-        ### Operating Cost per Ton Product
-        ${(operating_data.get('total_annual_operating_cost', 0) / st.session_state.get('process_data', {}).get('production_rate', 1)):,.2f} per ton
-        """
-        
-        report_content['Operating Cost Analysis'] = operating_analysis
+        report_content['Operating Cost Analysis'] = OPERATING_ANALYSIS_TEMPLATE.format_map(defaultdict(
+            int, operating_data,
+            opex_per_ton=operating_data.get('total_annual_operating_cost', 0) / production_rate
+        ))
     
     # Profitability Analysis
     if "Profitability Analysis" in report_sections and 'Profitability Analysis' in available_data:
         prof_data = available_data['Profitability Analysis']
         
-        profitability_analysis = f"""
-        ## Profitability Analysis
-        
-        ### Financial Metrics
-        - **Net Present Value:** ${prof_data.get('npv', 0):,.2f}
-        - **Internal Rate of Return:** {prof_data.get('irr', 0):.1f}%
-        - **Payback Period:** {prof_data.get('payback_period', 0):.1f} years
-        - **Profitability Index:** {prof_data.get('profitability_index', 0):.2f}
-        - **Return on Investment:** {prof_data.get('roi', 0):.1f}%
-        
-        ### Annual Cash Flow
-        **Average Annual Cash Flow:** ${prof_data.get('annual_cash_flow', 0):,.2f}
-        
-        ### Project Economics Summary
-        - **Total Project Revenue:** ${prof_data.get('total_revenue', 0):,.2f}
-        - **Total Project Costs:** ${prof_data.get('total_costs', 0):,.2f}
-        - **Net Project Value:** ${(prof_data.get('total_revenue', 0) - prof_data.get('total_costs', 0)):,.2f}
-        """
-        
-        report_content['Profitability Analysis'] = profitability_analysis
+        report_content['Profitability Analysis'] = PROFITABILITY_ANALYSIS_TEMPLATE.format_map(defaultdict(
+            int, prof_data,
+            net_project_value=prof_data.get('total_revenue', 0) - prof_data.get('total_costs', 0)
+        ))
     
     # Recommendations
     if "Recommendations" in report_sections:
-        recommendations = """
-        ## Recommendations
-        
-        ### Strategic Recommendations
-        1. **Process Optimization:** Focus on improving yield and reducing raw material consumption
-        2. **Cost Control:** Implement cost monitoring systems for key expense categories
-        3. **Risk Management:** Develop contingency plans for market volatility
-        4. **Technology:** Consider process intensification opportunities
-        
-        ### Next Steps
-        1. Detailed engineering design
-        2. Vendor quotations for major equipment
-        3. Environmental and safety assessments
-        4. Financing arrangements
-        5. Project implementation planning
-        
-        ### Risk Mitigation
-        - Secure long-term supply contracts for key raw materials
-        - Consider product price hedging strategies
-        - Plan for regulatory compliance requirements
-        - Implement robust process control systems
-        """
-        
-        report_content['Recommendations'] = recommendations
+        report_content['Recommendations'] = RECOMMENDATIONS_TEXT
     
     # Display Report Preview
     st.header("📄 Report Preview")
@@ -271,136 +428,109 @@ if st.button("🔍 Generate Report Preview", type="primary"):
     
     with col1:
         # PDF Export
-        if st.button("📄 Export as PDF"):
-            try:
-                # Create PDF
-                buffer = io.BytesIO()
-                doc = SimpleDocTemplate(buffer, pagesize=letter)
-                styles = getSampleStyleSheet()
-                story = []
-                
-                # Title
-                title_style = ParagraphStyle(
-                    'CustomTitle',
-                    parent=styles['Heading1'],
-                    fontSize=18,
-                    textColor=colors.HexColor('#1f77b4'),
-                    spaceAfter=30
-                )
-                story.append(Paragraph(report_title, title_style))
-                story.append(Spacer(1, 12))
-                
-                # Add content
-                for section_name in report_sections:
-                    if section_name in report_content:
-                        # Section header
-                        story.append(Paragraph(section_name, styles['Heading2']))
-                        story.append(Spacer(1, 12))
-                        
-                        # Section content (simplified for PDF)
-                        content = report_content[section_name].replace('#', '').replace('*', '')
-                        lines = content.split('\n')
-                        for line in lines:
-                            if line.strip():
-                                story.append(Paragraph(line.strip(), styles['Normal']))
-                        story.````````append(Spacer(1, 6))
-                
-                # Build PDF
-                doc.build(story)
-                
-                # Download button
-                pdf_data = buffer.getvalue()
-                buffer.close()
-                
-                st.download_button(
-                    label="📥 Download PDF Report",
-                    data=pdf_data,
-                    file_name=f"{project_name.replace(' ', '_')}_Report_{datetime.now().strftime('%Y%m%d')}.pdf",
-                    mime="application/pdf"
-                )
-                
-            except Exception as e:
-                st.error(f"PDF generation error: {str(e)}")
+        try:
+            # Create PDF from the sections in report order
+            pdf_data = build_pdf_report(
+                report_title,
+                tuple((section_name, report_content[section_name])
+                      for section_name in report_sections if section_name in report_content)
+            )
+            
+            # Download button
+            st.download_button(
+                label="📥 Download PDF Report",
+                data=pdf_data,
+                file_name=f"{project_name.replace(' ', '_')}_Report_{datetime.now().strftime('%Y%m%d')}.pdf",
+                mime="application/pdf"
+            )
+            
+        except Exception as e:
+            st.error(f"PDF generation error: {str(e)}")
     
     with col2:
         # Excel Export
-        if st.button("📊 Export as Excel"):
-            try:
-                # Create Excel workbook with multiple sheets
-                with pd.ExcelWriter(f"{project_name}_Analysis.xlsx", engine='openpyxl') as writer:
-                    
-                    # Summary sheet
-                    if 'calculations' in available_data:
-                        summary_data = {
-                            'Metric': ['NPV', 'IRR (%)', 'Payback (years)', 'ROI (%)', 'Prof. Index'],
-                            'Value': [
-                                available_data['Profitability Analysis']['npv'],
-                                available_data['Profitability Analysis']['irr'],
-                                available_data['Profitability Analysis']['payback_period'],
-                                available_data['Profitability Analysis']['roi'],
-                                available_data['Profitability Analysis']['profitability_index']
-                            ]
-                        }
-                        pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
-                    
-                    # Capital costs sheet
-                    if 'Capital Costs' in available_data:
-                        capital_data = available_data['Capital Costs']
-                        capital_df = pd.DataFrame([
-                            ['Equipment Cost', capital_data.get('installed_equipment_cost', 0)],
-                            ['Engineering', capital_data.get('engineering_cost', 0)],
-                            ['Construction', capital_data.get('construction_cost', 0)],
-                            ['Contingency', capital_data.get('contingency', 0)],
-                            ['Working Capital', capital_data.get('working_capital', 0)],
-                            ['Total CAPEX', capital_data.get('total_capital_investment', 0)]
-                        ], columns=['Item', 'Cost ($)'])
-                        capital_df.to_excel(writer, sheet_name='Capital Costs', index=False)
-                    
-                    # Operating costs sheet
-                    if 'Operating Costs' in available_data:
-                        opex_data = available_data['Operating Costs']
-                        opex_df = pd.DataFrame([
-                            ['Raw Materials', opex_data.get('total_raw_material_cost', 0)],
-                            ['Utilities', opex_data.get('total_utility_cost', 0)],
-                            ['Labor', opex_data.get('total_labor_cost', 0)],
-                            ['Maintenance', opex_data.get('maintenance_cost', 0)],
-                            ['Overhead', opex_data.get('total_overhead_cost', 0)],
-                            ['Total OPEX', opex_data.get('total_annual_operating_cost', 0)]
-                        ], columns=['Item', 'Annual Cost ($)'])
-                        opex_df.to_excel(writer, sheet_name='Operating Costs', index=False)
-                
-                st.success("✅ Excel file created successfully!")
-                
-            except Exception as e:
-                st.error(f"Excel generation error: {str(e)}")
+        try:
+            # Create Excel workbook with multiple sheets
+            sheets = []
+            
+            # Summary sheet
+            if 'Profitability Analysis' in available_data:
+                prof_data = available_data['Profitability Analysis']
+                sheets.append(('Summary', build_sheet_frame({
+                    'NPV': prof_data['npv'],
+                    'IRR (%)': prof_data['irr'],
+                    'Payback (years)': prof_data['payback_period'],
+                    'ROI (%)': prof_data['roi'],
+                    'Prof. Index': prof_data['profitability_index']
+                }, 'Value', label_column='Metric')))
+            
+            # Capital costs sheet
+            if 'Capital Costs' in available_data:
+                capital_data = available_data['Capital Costs']
+                sheets.append(('Capital Costs', build_sheet_frame({
+                    'Equipment Cost': capital_data.get('installed_equipment_cost', 0),
+                    'Engineering': capital_data.get('engineering_cost', 0),
+                    'Construction': capital_data.get('construction_cost', 0),
+                    'Contingency': capital_data.get('contingency', 0),
+                    'Working Capital': capital_data.get('working_capital', 0),
+                    'Total CAPEX': capital_data.get('total_capital_investment', 0)
+                }, 'Cost ($)')))
+            
+            # Operating costs sheet
+            if 'Operating Costs' in available_data:
+                opex_data = available_data['Operating Costs']
+                sheets.append(('Operating Costs', build_sheet_frame({
+                    'Raw Materials': opex_data.get('total_raw_material_cost', 0),
+                    'Utilities': opex_data.get('total_utility_cost', 0),
+                    'Labor': opex_data.get('total_labor_cost', 0),
+                    'Maintenance': opex_data.get('maintenance_cost', 0),
+                    'Overhead': opex_data.get('total_overhead_cost', 0),
+                    'Total OPEX': opex_data.get('total_annual_operating_cost', 0)
+                }, 'Annual Cost ($)')))
+            
+            if sheets:
+                st.download_button(
+                    label="📥 Download Excel Workbook",
+                    data=build_excel_report(tuple(sheets)),
+                    file_name=f"{project_name.replace(' ', '_')}_Analysis.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+            else:
+                st.warning("No analysis data available to export.")
+            
+        except Exception as e:
+            st.error(f"Excel generation error: {str(e)}")
     
     with col3:
         # JSON Export
-        if st.button("📋 Export as JSON"):
-            try:
-                # Compile all data
-                export_data = {
-                    'report_metadata': {
-                        'title': report_title,
-                        'project_name': project_name,
-                        'author': author_name,
-                        'date': report_date.isoformat(),
-                        'generated_timestamp': datetime.now().isoformat()
-                    },
-                    'analysis_data': available_data
-                }
-                
-                json_data = json.dumps(export_data, indent=2, default=str)
-                
-                st.download_button(
-                    label="📥 Download JSON Data",
-                    data=json_data,
-                    file_name=f"{project_name.replace(' ', '_')}_Data_{datetime.now().strftime('%Y%m%d')}.json",
-                    mime="application/json"
-                )
-                
-            except Exception as e:
-                st.error(f"JSON export error: {str(e)}")
+        try:
+            # Compile all data
+            export_data = {
+                'report_metadata': {
+                    'title': report_title,
+                    'project_name': project_name,
+                    'author': author_name,
+                    'date': report_date.isoformat(),
+                    'generated_timestamp': datetime.now().isoformat()
+                },
+                'analysis_data': available_data
+            }
+            
+            json_data = orjson.dumps(
+                export_data,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+            
+            st.download_button(
+                label="📥 Download JSON Data",
+                data=json_data,
+                file_name=f"{project_name.replace(' ', '_')}_Data_{datetime.now().strftime('%Y%m%d')}.json",
+                mime="application/json"
+            )
+            
+        except Exception as e:
+            st.error(f"JSON export error: {str(e)}")
 
 # Report Templates
 st.header("📋 Report Templates")
@@ -421,61 +551,26 @@ with template_col2:
 if include_charts and available_data:
     st.header("📊 Report Visualizations")
     
-    if 'Profitability Analysis' in available_data:
+    if 'Profitability Analysis' in available_data and 'Profitability Analysis' in report_sections:
         calc_data = available_data['Profitability Analysis']
         
         # Financial metrics comparison
-        metrics_data = {
-            'Metric': ['NPV ($M)', 'IRR (%)', 'Payback (years)', 'ROI (%)'],
-            'Value': [
-                calc_data.get('npv', 0) / 1e6,
-                calc_data.get('irr', 0),
-                calc_data.get('payback_period', 0),
-                calc_data.get('roi', 0)
-            ],
-            'Benchmark': [5, 15, 5, 20]  # Industry benchmarks
-        }
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            name='Project',
-            x=metrics_data['Metric'],
-            y=metrics_data['Value'],
-            marker_color='#1f77b4'
-        ))
-        fig.add_trace(go.Bar(
-            name='Industry Benchmark',
-            x=metrics_data['Metric'],
-            y=metrics_data['Benchmark'],
-            marker_color='#ff7f0e',
-            opacity=0.7
+        fig = make_metrics_benchmark_bar((
+            calc_data.get('npv', 0) / 1e6,
+            calc_data.get('irr', 0),
+            calc_data.get('payback_period', 0),
+            calc_data.get('roi', 0)
         ))
         
-        fig.update_layout(
-            title='Financial Metrics vs Industry Benchmarks',
-            barmode='group',
-            yaxis_title='Value'
-        )
-        
         st.plotly_chart(fig, use_container_width=True)
     
     # Cost breakdown pie chart
-    if 'Capital Costs' in available_data:
+    if 'Capital Costs' in available_data and 'Capital Cost Analysis' in report_sections:
         capital_data = available_data['Capital Costs']
         
-        cost_categories = {
-            'Equipment': capital_data.get('installed_equipment_cost', 0),
-            'Engineering': capital_data.get('engineering_cost', 0),
-            'Construction': capital_data.get('construction_cost', 0),
-            'Contingency': capital_data.get('contingency', 0),
-            'Working Capital': capital_data.get('working_capital', 0)
-        }
-        
-        fig_pie = px.pie(
-            values=list(cost_categories.values()),
-            names=list(cost_categories.keys()),
-            title='Capital Cost Breakdown'
-        )
+        fig_pie = make_capital_breakdown_pie(tuple(
+            (category, capital_data.get(key, 0)) for category, key in CAPITAL_BREAKDOWN_ITEMS
+        ))
         
         st.plotly_chart(fig_pie, use_container_width=True)
 
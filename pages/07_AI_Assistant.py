@@ -1,8 +1,25 @@
 
 import streamlit as st
-import os
-from src.llm.groq_client import ProcessEconomicsGroq
+from src.llm.groq_client import ProcessEconomicsGroq, resolve_api_key
 import json
+import orjson
+from datetime import datetime
+
+EXAMPLE_QUESTIONS = (
+    "How can I reduce my operating costs?",
+    "Is my IRR acceptable for this industry?",
+    "What are the main risks for my process?",
+    "How does my payback period compare to industry standards?",
+    "What process improvements should I consider?",
+    "How sensitive is my NPV to raw material price changes?"
+)
+
+def queue_example_question():
+    """
+    Queue the picked example question and clear the selection so it can be picked again
+    """
+    st.session_state.pending_question = st.session_state.example_question
+    st.session_state.example_question = None
 
 st.set_page_config(
     page_title="AI Assistant - ChemEconAI",
@@ -14,7 +31,8 @@ st.title("🤖 AI Process Economics Assistant")
 st.markdown("Get expert insights and recommendations for your chemical process economics!")
 
 # Check for API key
-if not (st.secrets.get("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") or os.getenv("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")):
+groq_api_key = resolve_api_key()
+if not groq_api_key:
     st.error("⚠️ **Groq API key not found!**")
     st.markdown("""
     To use the AI Assistant, please add your Groq API key:
@@ -34,7 +52,67 @@ if not (st.secrets.get("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
 # Initialize Groq client
 @st.cache_resource
 def get_groq_client():
-    return ProcessEconomicsGroq()
+    return ProcessEconomicsGroq(api_key=groq_api_key)
+
+def cache_key(data) -> str:
+    """
+    Serialize a dict into a stable, hashable cache key
+    """
+    return json.dumps(data, sort_keys=True, default=str)
+
+class AIResponseError(Exception):
+    """Error reply from the AI client, raised so that it is not cached"""
+    pass
+
+def checked_response(response: str) -> str:
+    """
+    Raise the client's error replies instead of returning them
+    """
+    if response.startswith("⚠️"):
+        raise AIResponseError(response)
+    return response
+
+# AI responses are cached per input for an hour, so reruns don't re-hit the API;
+# st.cache_data does not cache exceptions, so failed calls are retried
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_analyze_economics(calculations_json: str) -> str:
+    return checked_response(get_groq_client().analyze_economics(json.loads(calculations_json)))
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_optimize_costs(cost_breakdown_json: str) -> str:
+    return checked_response(get_groq_client().optimize_costs(json.loads(cost_breakdown_json)))
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_executive_summary(summary_json: str) -> str:
+    return checked_response(get_groq_client().generate_executive_summary(json.loads(summary_json)))
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_process_advice(process_json: str, question: str) -> str:
+    return checked_response(get_groq_client().get_process_advice(json.loads(process_json), question))
+
+@st.cache_data(show_spinner=False)
+def build_chat_export(messages: list) -> bytes:
+    """
+    Serialize the chat history compactly; re-serialized only when the messages change
+    """
+    return orjson.dumps(messages, default=str)
+
+# Quick Action -> (reply heading, spinner text, cached AI helper)
+QUICK_ACTIONS = {
+    'analyze_economics': ("💰 Economic Analysis", "🧠 Analyzing your economics...", cached_analyze_economics),
+    'optimize_costs': ("🔧 Cost Optimization", "🔍 Finding optimization opportunities...", cached_optimize_costs),
+    'executive_summary': ("📋 Executive Summary", "📝 Generating executive summary...", cached_executive_summary),
+    'industry_benchmarks': ("🎯 Industry Benchmarks", "📊 Comparing with industry benchmarks...", cached_process_advice)
+}
+
+def ask_ai(cached_call, *args) -> str:
+    """
+    Call a cached AI helper, turning an uncached error reply back into its message
+    """
+    try:
+        return cached_call(*args)
+    except AIResponseError as e:
+        return str(e)
 
 try:
     groq_client = get_groq_client()
@@ -91,6 +169,9 @@ with st.sidebar:
             value=1000000.0
         )
 
+# Serialize the process context once for the cached AI helpers
+process_data_key = cache_key(process_data)
+
 # Initialize chat history
 if "messages" not in st.session_state:
     st.session_state.messages = [
@@ -101,86 +182,76 @@ if "messages" not in st.session_state:
     ]
 
 # Quick action buttons
+calculations = st.session_state.get('calculations') or {}
 st.markdown("### 🚀 Quick Actions")
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     if st.button("💰 Analyze Economics", help="Get insights on your economic calculations"):
-        if 'calculations' in st.session_state and st.session_state.calculations:
-            with st.spinner("🧠 Analyzing your economics..."):
-                response = groq_client.analyze_economics(st.session_state.calculations)
-                st.session_state.messages.append({
-                    "role": "assistant", 
-                    "content": f"## 💰 Economic Analysis\n\n{response}"
-                })
-                st.rerun()
+        if calculations:
+            st.session_state.pending_action = ('analyze_economics', cache_key(calculations))
         else:
             st.warning("Complete the Profitability analysis first!")
 
 with col2:
     if st.button("🔧 Optimize Costs", help="Get cost optimization suggestions"):
-        if 'cost_breakdown' in st.session_state and st.session_state.cost_breakdown:
-            with st.spinner("🔍 Finding optimization opportunities..."):
-                response = groq_client.optimize_costs(st.session_state.cost_breakdown)
-                st.session_state.messages.append({
-                    "role": "assistant", 
-                    "content": f"## 🔧 Cost Optimization\n\n{response}"
-                })
-                st.rerun()
+        cost_breakdown = st.session_state.get('cost_breakdown')
+        if cost_breakdown:
+            st.session_state.pending_action = ('optimize_costs', cache_key(cost_breakdown))
         else:
             st.warning("Complete the Operating Costs analysis first!")
 
 with col3:
     if st.button("📋 Executive Summary", help="Generate executive summary"):
-        with st.spinner("📝 Generating executive summary..."):
-            summary_data = {
-                'name': process_data.get('process_type', 'Chemical Process'),
-                'investment': process_data.get('investment', 0),
-                'npv': st.session_state.get('calculations', {}).get('npv', 0),
-                'irr': st.session_state.get('calculations', {}).get('irr', 0),
-                'payback': st.session_state.get('calculations', {}).get('payback_period', 0),
-                'production_rate': process_data.get('production_rate', 0)
-            }
-            response = groq_client.generate_executive_summary(summary_data)
-            st.session_state.messages.append({
-                "role": "assistant", 
-                "content": f"## 📋 Executive Summary\n\n{response}"
-            })
-            st.rerun()
+        summary_data = {
+            'name': process_data.get('process_type', 'Chemical Process'),
+            'investment': process_data.get('investment', 0),
+            'npv': calculations.get('npv', 0),
+            'irr': calculations.get('irr', 0),
+            'payback': calculations.get('payback_period', 0),
+            'production_rate': process_data.get('production_rate', 0)
+        }
+        st.session_state.pending_action = ('executive_summary', cache_key(summary_data))
 
 with col4:
     if st.button("🎯 Industry Benchmarks", help="Compare with industry standards"):
         question = f"What are the typical industry benchmarks for a {process_data.get('process_type', 'chemical')} process producing {process_data.get('production_rate', 1000)} tons/year? Compare my process economics with industry standards."
-        with st.spinner("📊 Comparing with industry benchmarks..."):
-            response = groq_client.get_process_advice(process_data, question)
-            st.session_state.messages.append({
-                "role": "assistant", 
-                "content": f"## 🎯 Industry Benchmarks\n\n{response}"
-            })
-            st.rerun()
-
-# Display chat messages
-st.markdown("### 💬 Chat with AI Assistant")
-
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        st.markdown(message["content"])
-
-# Chat input
-if prompt := st.chat_input("Ask me anything about your process economics..."):
-    # Add user message to chat history
-    st.session_state.messages.append({"role": "user", "content": prompt})
+        st.session_state.pending_action = ('industry_benchmarks', process_data_key, question)
+
+# Run the requested Quick Action once; the chat below already shows its reply
+if 'pending_action' in st.session_state:
+    action, *action_args = st.session_state.pop('pending_action')
+    heading, spinner_text, cached_call = QUICK_ACTIONS[action]
+    with st.spinner(spinner_text):
+        response = ask_ai(cached_call, *action_args)
+    st.session_state.messages.append({
+        "role": "assistant", 
+        "content": f"## {heading}\n\n{response}"
+    })
+
+# Sending a chat message only reruns the chat, not the whole page
+@st.fragment
+def chat_section(process_data: dict):
+    # Display chat messages
+    st.markdown("### 💬 Chat with AI Assistant")
     
-    # Display user message
-    with st.chat_message("user"):
-        st.markdown(prompt)
+    for message in st.session_state.messages:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
     
-    # Generate and display assistant response
-    with st.chat_message("assistant"):
-        with st.spinner("🤔 Thinking..."):
+    # Chat input
+    if prompt := st.chat_input("Ask me anything about your process economics..."):
+        # Add user message to chat history
+        st.session_state.messages.append({"role": "user", "content": prompt})
+        
+        # Display user message
+        with st.chat_message("user"):
+            st.markdown(prompt)
+        
+        # Stream the assistant response as it is generated
+        with st.chat_message("assistant"):
             try:
-                response = groq_client.get_process_advice(process_data, prompt)
-                st.markdown(response)
+                response = st.write_stream(groq_client.stream_process_advice(process_data, prompt))
                 
                 # Add assistant response to chat history
                 st.session_state.messages.append({
@@ -195,6 +266,8 @@ if prompt := st.chat_input("Ask me anything about your process economics..."):
                     "content": error_msg
                 })
 
+chat_section(process_data)
+
 # Sidebar chat controls
 with st.sidebar:
     st.markdown("---")
@@ -205,33 +278,32 @@ with st.sidebar:
         st.rerun()
     
     if st.button("💾 Export Chat"):
-        chat_export = json.dumps(st.session_state.messages, indent=2)
         st.download_button(
             label="📁 Download Chat",
-            data=chat_export,
-            file_name=f"chemai_chat_{pd.Timestamp.now().strftime('%Y%m%d_%H%M')}.json",
+            data=build_chat_export(st.session_state.messages),
+            file_name=f"chemai_chat_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
             mime="application/json"
         )
     
     # Example questions
     st.markdown("### 💡 Example Questions")
-    example_questions = [
-        "How can I reduce my operating costs?",
-        "Is my IRR acceptable for this industry?",
-        "What are the main risks for my process?",
-        "How does my payback period compare to industry standards?",
-        "What process improvements should I consider?",
-        "How sensitive is my NPV to raw material price changes?"
-    ]
+    st.radio(
+        "Example Questions",
+        EXAMPLE_QUESTIONS,
+        index=None,
+        format_func=lambda question: f"💬 {question}",
+        key="example_question",
+        on_change=queue_example_question,
+        label_visibility="collapsed"
+    )
     
-    for question in example_questions:
-        if st.button(f"💬 {question}", key=f"example_{hash(question)}"):
-            # Add to chat
-            st.session_state.messages.append({"role": "user", "content": question})
-            with st.spinner("🤔 Thinking..."):
-                response = groq_client.get_process_advice(process_data, question)
-                st.session_state.messages.append({"role": "assistant", "content": response})
-            st.rerun()
+    if question := st.session_state.pop('pending_question', None):
+        # Add to chat
+        st.session_state.messages.append({"role": "user", "content": question})
+        with st.spinner("🤔 Thinking..."):
+            response = ask_ai(cached_process_advice, process_data_key, question)
+            st.session_state.messages.append({"role": "assistant", "content": response})
+        st.rerun()
 
 # Footer
 st.markdown("---")
@@ -3,10 +3,77 @@
 Equipment cost database and correlations
 """
 
+import math
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from functools import lru_cache, cached_property
 from typing import Dict, Optional, List
+from ..utils.calculations import scaled_equipment_cost
+
+CEPCI_BASE_YEAR = 2020
+
+EQUIPMENT_CSV_DTYPES = {
+    'equipment_type': str,
+    'base_cost': np.float64,
+    'base_capacity': np.float64,
+    'base_capacity_unit': 'category',
+    'scaling_factor': np.float64,
+    'material_cs': np.float64,
+    'material_ss': np.float64,
+    'material_hastelloy': np.float64,
+    'description': str
+}
+
+CEPCI_DATA = {
+    2010: 550.8,
+    2015: 556.8,
+    2018: 603.1,
+    2020: 596.2,
+    2021: 708.0,
+    2022: 816.0,
+    2023: 832.0,
+    2024: 850.0  # Estimated
+}
+
+DEFAULT_EQUIPMENT_DATA = {
+    'equipment_type': ['reactor_cstr', 'reactor_batch', 'distillation_column', 
+                     'heat_exchanger_shell_tube', 'pump_centrifugal', 'tank_storage'],
+    'base_cost': [50000, 45000, 80000, 15000, 3000, 10000],
+    'base_capacity': [1000, 1000, 100, 50, 100, 1000],
+    'base_capacity_unit': ['L', 'L', 'theoretical_plates', 'm2', 'L_min', 'L'],
+    'scaling_factor': [0.65, 0.70, 0.70, 0.60, 0.35, 0.85],
+    'material_cs': [1.0, 1.0, 1.0, 1.0, 1.0, 1.0],
+    'material_ss': [2.5, 2.5, 2.2, 2.0, 1.8, 2.0],
+    'material_hastelloy': [6.0, 6.0, 4.5, 3.5, 3.0, 4.0],
+    'description': ['Continuous stirred tank reactor', 'Batch reactor with agitation',
+                  'Distillation column with trays', 'Shell and tube heat exchanger',
+                  'Centrifugal pump', 'Storage tank']
+}
+
+@lru_cache(maxsize=1)
+def _default_equipment_frame() -> pd.DataFrame:
+    """
+    Default equipment database, built once; instances take copies
+    """
+    return pd.DataFrame(DEFAULT_EQUIPMENT_DATA)
+
+MATERIAL_COLUMNS = {
+    'carbon_steel': 'material_cs',
+    'stainless_steel': 'material_ss',
+    'hastelloy': 'material_hastelloy'
+}
+
+# Bounded because the material strings come from callers
+@lru_cache(maxsize=128)
+def _material_column(material: str) -> str:
+    """
+    Name of the material factor column for a material of construction
+    """
+    material_column = MATERIAL_COLUMNS.get(material)
+    if material_column is None:
+        material_column = f'material_{material.replace("_steel", "_").replace("steel", "").strip("_")}'
+    return material_column
 
 class EquipmentCostDatabase:
     """
@@ -14,9 +81,30 @@ class EquipmentCostDatabase:
     """
     
     def __init__(self):
+        # Tables and the lookups derived from them load on first use
         self.data_path = Path("data")
-        self.equipment_db = self._load_equipment_database()
-        self.cepci_data = self._load_cepci_data()
+        self._category_frames = {}
+    
+    @cached_property
+    def equipment_db(self) -> pd.DataFrame:
+        """
+        Equipment database, loaded on first access
+        """
+        return self._load_equipment_database()
+    
+    @cached_property
+    def equipment_index(self) -> Dict[str, Dict]:
+        """
+        Equipment records keyed by equipment type
+        """
+        return {record['equipment_type']: record for record in self.equipment_db.to_dict('records')}
+    
+    @cached_property
+    def cepci_data(self) -> Dict[int, float]:
+        """
+        CEPCI data, loaded on first access
+        """
+        return self._load_cepci_data()
     
     def _load_equipment_database(self) -> pd.DataFrame:
         """
@@ -24,45 +112,92 @@ class EquipmentCostDatabase:
         """
         try:
             db_path = self.data_path / "equipment_database.csv"
-            return pd.read_csv(db_path)
+            return pd.read_csv(db_path, dtype=EQUIPMENT_CSV_DTYPES)
         except FileNotFoundError:
             # Return default database if file not found
             return self._create_default_database()
     
+    @cached_property
+    def type_index(self) -> Dict[str, int]:
+        """
+        Row position of each equipment type in the correlation arrays
+        """
+        return {equipment_type: i for i, equipment_type in enumerate(self.equipment_db['equipment_type'])}
+    
+    @cached_property
+    def base_costs(self) -> np.ndarray:
+        """
+        Base cost of each equipment type
+        """
+        return self.equipment_db['base_cost'].to_numpy(dtype=np.float64)
+    
+    @cached_property
+    def base_capacities(self) -> np.ndarray:
+        """
+        Base capacity of each equipment type
+        """
+        return self.equipment_db['base_capacity'].to_numpy(dtype=np.float64)
+    
+    @cached_property
+    def scaling_factors(self) -> np.ndarray:
+        """
+        Capacity scaling exponent of each equipment type
+        """
+        return self.equipment_db['scaling_factor'].to_numpy(dtype=np.float64)
+    
+    @cached_property
+    def material_column_index(self) -> Dict[str, int]:
+        """
+        Column position of each material factor in the material factor array
+        """
+        material_columns = [column for column in self.equipment_db.columns if column.startswith('material_')]
+        return {column: i for i, column in enumerate(material_columns)}
+    
+    @cached_property
+    def material_factors(self) -> np.ndarray:
+        """
+        Material factors by equipment type, with a trailing column of ones for materials without a factor column
+        """
+        return np.hstack([
+            self.equipment_db[list(self.material_column_index)].to_numpy(dtype=np.float64),
+            np.ones((len(self.equipment_db), 1))
+        ])
+    
     def _create_default_database(self) -> pd.DataFrame:
         """
         Create default equipment database
         """
-        data = {
-            'equipment_type': ['reactor_cstr', 'reactor_batch', 'distillation_column', 
-                             'heat_exchanger_shell_tube', 'pump_centrifugal', 'tank_storage'],
-            'base_cost': [50000, 45000, 80000, 15000, 3000, 10000],
-            'base_capacity': [1000, 1000, 100, 50, 100, 1000],
-            'base_capacity_unit': ['L', 'L', 'theoretical_plates', 'm2', 'L_min', 'L'],
-            'scaling_factor': [0.65, 0.70, 0.70, 0.60, 0.35, 0.85],
-            'material_cs': [1.0, 1.0, 1.0, 1.0, 1.0, 1.0],
-            'material_ss': [2.5, 2.5, 2.2, 2.0, 1.8, 2.0],
-            'material_hastelloy': [6.0, 6.0, 4.5, 3.5, 3.0, 4.0],
-            'description': ['Continuous stirred tank reactor', 'Batch reactor with agitation',
-                          'Distillation column with trays', 'Shell and tube heat exchanger',
-                          'Centrifugal pump', 'Storage tank']
-        }
-        return pd.DataFrame(data)
+        # Copy so edits to one database's table stay with that database
+        return _default_equipment_frame().copy()
     
     def _load_cepci_data(self) -> Dict[int, float]:
         """
         Load CEPCI (Chemical Engineering Plant Cost Index) data
         """
-        return {
-            2010: 550.8,
-            2015: 556.8,
-            2018: 603.1,
-            2020: 596.2,
-            2021: 708.0,
-            2022: 816.0,
-            2023: 832.0,
-            2024: 850.0  # Estimated
-        }
+        return dict(CEPCI_DATA)
+    
+    @cached_property
+    def _cepci_ratio(self) -> Dict[int, float]:
+        """
+        CEPCI ratio to the 2020 base year for every year on record
+        """
+        base_cepci = self.cepci_data.get(CEPCI_BASE_YEAR, 596.2)
+        return {year: index_value / base_cepci for year, index_value in self.cepci_data.items()}
+    
+    def cepci_factor(self, year: int) -> float:
+        """
+        CEPCI escalation factor from the 2020 base year to a given year
+        
+        Args:
+            year: Year for cost estimation
+            
+        Returns:
+            Ratio of the year's CEPCI to the base year CEPCI
+        """
+        cepci_ratio = self._cepci_ratio.get(year)
+        if cepci_ratio is None:
+            cepci_ratio = 850.0 / self.cepci_data.get(CEPCI_BASE_YEAR, 596.2)
+        return cepci_ratio
     
     def get_equipment_data(self, equipment_type: str) -> Optional[Dict]:
         """
@@ -74,12 +209,12 @@ class EquipmentCostDatabase:
         Returns:
             Dictionary with equipment data or None if not found
         """
-        equipment_row = self.equipment_db[self.equipment_db['equipment_type'] == equipment_type]
+        equipment_data = self.equipment_index.get(equipment_type)
         
-        if equipment_row.empty:
+        if equipment_data is None:
             return None
         
-        return equipment_row.iloc[0].to_dict()
+        return dict(equipment_data)
     
     def estimate_equipment_cost(self, equipment_type: str, capacity: float,
                               material: str = 'carbon_steel', year: int = 2024) -> Dict:
@@ -95,7 +230,7 @@ class EquipmentCostDatabase:
         Returns:
             Dictionary with cost breakdown
         """
-        equipment_data = self.get_equipment_data(equipment_type)
+        equipment_data = self.equipment_index.get(equipment_type)
         
         if not equipment_data:
             raise ValueError(f"Equipment type '{equipment_type}' not found")
@@ -106,37 +241,62 @@ class EquipmentCostDatabase:
         scaling_factor = equipment_data['scaling_factor']
         
         # Capacity scaling
-        scaled_cost = base_cost * (capacity / base_capacity) ** scaling_factor
+        capacity_factor = math.pow(capacity / base_capacity, scaling_factor)
+        scaled_cost = base_cost * capacity_factor
         
         # Material factor
-        material_column = f'material_{material.replace("_steel", "_").replace("steel", "").strip("_")}'
-        if material == 'carbon_steel':
-            material_column = 'material_cs'
-        elif material == 'stainless_steel':
-            material_column = 'material_ss'
-        
-        material_factor = equipment_data.get(material_column, 1.0)
+        material_factor = equipment_data.get(_material_column(material), 1.0)
         material_adjusted_cost = scaled_cost * material_factor
         
         # CEPCI adjustment
-        base_year = 2020
-        base_cepci = self.cepci_data.get(base_year, 596.2)
-        current_cepci = self.cepci_data.get(year, 850.0)
-        
-        final_cost = material_adjusted_cost * (current_cepci / base_cepci)
+        cepci_factor = self.cepci_factor(year)
+        final_cost = material_adjusted_cost * cepci_factor
         
         return {
             'base_cost': base_cost,
-            'capacity_factor': (capacity / base_capacity) ** scaling_factor,
+            'capacity_factor': capacity_factor,
             'scaled_cost': scaled_cost,
             'material_factor': material_factor,
             'material_adjusted_cost': material_adjusted_cost,
-            'cepci_factor': current_cepci / base_cepci,
+            'cepci_factor': cepci_factor,
             'final_cost': final_cost,
             'unit': equipment_data['base_capacity_unit'],
             'description': equipment_data['description']
         }
     
+    def estimate_equipment_costs(self, equipment_types: List[str], capacities: np.ndarray,
+                                 materials: List[str], year: int = 2024) -> np.ndarray:
+        """
+        Estimate final costs for many items of equipment in one pass
+        
+        Args:
+            equipment_types: Type of each item of equipment
+            capacities: Capacity of each item
+            materials: Material of construction of each item
+            year: Year for cost estimation
+            
+        Returns:
+            Array of final (CEPCI-adjusted) costs
+        """
+        n_items = len(equipment_types)
+        try:
+            type_idx = np.fromiter((self.type_index[equipment_type] for equipment_type in equipment_types),
+                                   dtype=np.intp, count=n_items)
+        except KeyError as e:
+            raise ValueError(f"Equipment type '{e.args[0]}' not found")
+        
+        no_factor = self.material_factors.shape[1] - 1
+        material_idx = np.fromiter(
+            (self.material_column_index.get(_material_column(material), no_factor) for material in materials),
+            dtype=np.intp, count=n_items
+        )
+        
+        capacities = np.asarray(capacities, dtype=np.float64)
+        
+        return scaled_equipment_cost(capacities, self.base_costs[type_idx], self.base_capacities[type_idx],
+                                     self.scaling_factors[type_idx],
+                                     self.material_factors[type_idx, material_idx], self.cepci_factor(year))
+    
     def get_available_equipment_types(self) -> List[str]:
         """
         Get list of available equipment types
@@ -144,7 +304,7 @@ class EquipmentCostDatabase:
         Returns:
             List of equipment type names
         """
-        return self.equipment_db['equipment_type'].tolist()
+        return list(self.equipment_index)
     
     def get_equipment_by_category(self, category: str) -> pd.DataFrame:
         """
@@ -156,7 +316,15 @@ class EquipmentCostDatabase:
         Returns:
             DataFrame with matching equipment
         """
-        return self.equipment_db[self.equipment_db['equipment_type'].str.contains(category, case=False)]
+        category_key = category.lower()
+        category_frame = self._category_frames.get(category_key)
+        
+        if category_frame is None:
+            # The equipment table is static, so each category is only matched once
+            category_frame = self.equipment_db[self.equipment_db['equipment_type'].str.contains(category_key, case=False)]
+            self._category_frames[category_key] = category_frame
+        
+        return category_frame.copy()
     
     def update_cepci(self, year: int, index_value: float):
         """
@@ -167,6 +335,12 @@ class EquipmentCostDatabase:
             index_value: CEPCI index value
         """
         self.cepci_data[year] = index_value
+        
+        if year == CEPCI_BASE_YEAR:
+            # Every ratio changes with the base year; recompute on next use
+            self.__dict__.pop('_cepci_ratio', None)
+        else:
+            self._cepci_ratio[year] = index_value / self.cepci_data.get(CEPCI_BASE_YEAR, 596.2)
     
     def get_cost_range(self, equipment_type: str, capacity_range: tuple, 
                       material: str = 'carbon_steel') -> Dict:
@@ -181,15 +355,14 @@ class EquipmentCostDatabase:
         Returns:
             Dictionary with cost range information
         """
-        min_cap, max_cap = capacity_range
-        
-        min_cost_data = self.estimate_equipment_cost(equipment_type, min_cap, material)
-        max_cost_data = self.estimate_equipment_cost(equipment_type, max_cap, material)
+        min_cost, max_cost = self.estimate_equipment_costs(
+            [equipment_type, equipment_type], capacity_range, [material, material]
+        ).tolist()
         
         return {
             'capacity_range': capacity_range,
-            'cost_range': (min_cost_data['final_cost'], max_cost_data['final_cost']),
-            'unit': min_cost_data['unit'],
+            'cost_range': (min_cost, max_cost),
+            'unit': self.equipment_index[equipment_type]['base_capacity_unit'],
             'material': material,
             'equipment_type': equipment_type
         }
@@ -3,22 +3,130 @@
 Market data provider for chemical prices and trends
 """
 
+import copy
 import pandas as pd
 import numpy as np
+import time
 from pathlib import Path
+from functools import lru_cache, cached_property
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
+MATERIAL_CSV_DTYPES = {
+    'material_name': str,
+    'category': 'category',
+    'price_usd_per_kg': np.float64,
+    'unit': 'category',
+    'volatility': 'category',
+    'supplier_location': 'category',
+    'description': str
+}
+
+UTILITY_CSV_DTYPES = {
+    'utility_type': str,
+    'unit': 'category'
+}
+
+# Price range multipliers (low, high) and annual growth (mean, std) by price volatility
+VOLATILITY_PRICE_RANGE = {
+    'low': (0.95, 1.05),
+    'medium': (0.85, 1.15),
+    'high': (0.70, 1.30)
+}
+
+VOLATILITY_GROWTH = {
+    'low': (0.02, 0.01),     # 2% ± 1%
+    'medium': (0.03, 0.02),  # 3% ± 2%
+    'high': (0.04, 0.03)     # 4% ± 3%
+}
+
+# Seconds a 'last_updated' timestamp is reused before the clock is read again
+CLOCK_TTL_SECONDS = 1.0
+
+DEFAULT_MATERIAL_PRICES = {
+    'material_name': ['methanol', 'ethanol', 'acetone', 'sodium_hydroxide', 
+                    'sulfuric_acid', 'hydrochloric_acid', 'hydrogen', 'nitrogen'],
+    'category': ['solvent', 'solvent', 'solvent', 'base', 'acid', 'acid', 'gas', 'gas'],
+    'price_usd_per_kg': [0.45, 0.65, 1.20, 0.35, 0.25, 0.30, 3.50, 0.05],
+    'unit': ['kg', 'kg', 'kg', 'kg', 'kg', 'kg', 'kg', 'm3'],
+    'volatility': ['medium', 'medium', 'high', 'low', 'medium', 'medium', 'high', 'low'],
+    'supplier_location': ['global', 'global', 'global', 'global', 'regional', 
+                        'regional', 'regional', 'regional'],
+    'description': ['Methanol 99.5%', 'Ethanol 99.5%', 'Acetone 99.5%', 
+                  'Caustic soda 50%', 'Sulfuric acid 98%', 'HCl 37%', 
+                  'Hydrogen 99.9%', 'Nitrogen 99.9%']
+}
+
+DEFAULT_UTILITY_COSTS = {
+    'utility_type': ['electricity', 'steam_lp', 'steam_mp', 'steam_hp', 
+                   'cooling_water', 'process_water', 'natural_gas'],
+    'unit': ['dollar_per_kWh', 'dollar_per_ton', 'dollar_per_ton', 
+            'dollar_per_ton', 'dollar_per_m3', 'dollar_per_m3', 'dollar_per_MMBtu'],
+    'usa_gulf_coast': [0.08, 15.0, 18.0, 22.0, 0.05, 0.50, 8.0],
+    'usa_northeast': [0.12, 18.0, 22.0, 28.0, 0.08, 0.80, 12.0],
+    'europe_germany': [0.15, 22.0, 28.0, 35.0, 0.12, 1.20, 15.0],
+    'asia_singapore': [0.10, 16.0, 20.0, 25.0, 0.06, 0.60, 10.0],
+    'asia_china': [0.07, 12.0, 15.0, 18.0, 0.04, 0.40, 6.0]
+}
+
+MARKET_TRENDS = {
+    'chemicals': {
+        'solvents': {'trend': 'increasing', 'volatility': 'high'},
+        'acids': {'trend': 'stable', 'volatility': 'medium'},
+        'bases': {'trend': 'stable', 'volatility': 'low'}
+    },
+    'utilities': {
+        'electricity': {'trend': 'increasing', 'volatility': 'medium'},
+        'natural_gas': {'trend': 'volatile', 'volatility': 'high'},
+        'steam': {'trend': 'increasing', 'volatility': 'medium'}
+    }
+}
+
+@lru_cache(maxsize=1)
+def _default_material_prices_frame() -> pd.DataFrame:
+    """
+    Default material prices database, built once; instances take copies
+    """
+    return pd.DataFrame(DEFAULT_MATERIAL_PRICES)
+
+@lru_cache(maxsize=1)
+def _default_utility_costs_frame() -> pd.DataFrame:
+    """
+    Default utility costs database, built once; instances take copies
+    """
+    return pd.DataFrame(DEFAULT_UTILITY_COSTS)
+
 class MarketDataProvider:
     """
     Provider for chemical market data and pricing
     """
     
     def __init__(self):
+        # Price tables and their indexes load on first use
         self.data_path = Path("data")
-        self.material_prices = self._load_material_prices()
-        self.utility_costs = self._load_utility_costs()
-        self.market_trends = self._initialize_trends()
+        self._market_summary_cache = None
+        self.refresh_clock()
+    
+    @cached_property
+    def material_prices(self) -> pd.DataFrame:
+        """
+        Material prices, loaded on first access
+        """
+        return self._load_material_prices()
+    
+    @cached_property
+    def utility_costs(self) -> pd.DataFrame:
+        """
+        Utility costs, loaded on first access
+        """
+        return self._load_utility_costs()
+    
+    @cached_property
+    def market_trends(self) -> Dict:
+        """
+        Market trend data
+        """
+        return self._initialize_trends()
     
     def _load_material_prices(self) -> pd.DataFrame:
         """
@@ -26,7 +134,7 @@ class MarketDataProvider:
         """
         try:
             prices_path = self.data_path / "material_prices.csv"
-            return pd.read_csv(prices_path)
+            return pd.read_csv(prices_path, dtype=MATERIAL_CSV_DTYPES)
         except FileNotFoundError:
             return self._create_default_material_prices()
     
@@ -34,20 +142,8 @@ class MarketDataProvider:
         """
         Create default material prices database
         """
-        data = {
-            'material_name': ['methanol', 'ethanol', 'acetone', 'sodium_hydroxide', 
-                            'sulfuric_acid', 'hydrochloric_acid', 'hydrogen', 'nitrogen'],
-            'category': ['solvent', 'solvent', 'solvent', 'base', 'acid', 'acid', 'gas', 'gas'],
-            'price_usd_per_kg': [0.45, 0.65, 1.20, 0.35, 0.25, 0.30, 3.50, 0.05],
-            'unit': ['kg', 'kg', 'kg', 'kg', 'kg', 'kg', 'kg', 'm3'],
-            'volatility': ['medium', 'medium', 'high', 'low', 'medium', 'medium', 'high', 'low'],
-            'supplier_location': ['global', 'global', 'global', 'global', 'regional', 
-                                'regional', 'regional', 'regional'],
-            'description': ['Methanol 99.5%', 'Ethanol 99.5%', 'Acetone 99.5%', 
-                          'Caustic soda 50%', 'Sulfuric acid 98%', 'HCl 37%', 
-                          'Hydrogen 99.9%', 'Nitrogen 99.9%']
-        }
-        return pd.DataFrame(data)
+        # Copy so edits to one provider's table stay with that provider
+        return _default_material_prices_frame().copy()
     
     def _load_utility_costs(self) -> pd.DataFrame:
         """
@@ -55,7 +151,9 @@ class MarketDataProvider:
         """
         try:
             utility_path = self.data_path / "utility_costs.csv"
-            return pd.read_csv(utility_path)
+            # Location columns vary by file; only the description goes unused
+            return pd.read_csv(utility_path, dtype=UTILITY_CSV_DTYPES,
+                               usecols=lambda column: column != 'description')
         except FileNotFoundError:
             return self._create_default_utility_costs()
     
@@ -63,35 +161,50 @@ class MarketDataProvider:
         """
         Create default utility costs database
         """
-        data = {
-            'utility_type': ['electricity', 'steam_lp', 'steam_mp', 'steam_hp', 
-                           'cooling_water', 'process_water', 'natural_gas'],
-            'unit': ['dollar_per_kWh', 'dollar_per_ton', 'dollar_per_ton', 
-                    'dollar_per_ton', 'dollar_per_m3', 'dollar_per_m3', 'dollar_per_MMBtu'],
-            'usa_gulf_coast': [0.08, 15.0, 18.0, 22.0, 0.05, 0.50, 8.0],
-            'usa_northeast': [0.12, 18.0, 22.0, 28.0, 0.08, 0.80, 12.0],
-            'europe_germany': [0.15, 22.0, 28.0, 35.0, 0.12, 1.20, 15.0],
-            'asia_singapore': [0.10, 16.0, 20.0, 25.0, 0.06, 0.60, 10.0],
-            'asia_china': [0.07, 12.0, 15.0, 18.0, 0.04, 0.40, 6.0]
-        }
-        return pd.DataFrame(data)
+        return _default_utility_costs_frame().copy()
     
     def _initialize_trends(self) -> Dict:
         """
         Initialize market trend data
         """
-        return {
-            'chemicals': {
-                'solvents': {'trend': 'increasing', 'volatility': 'high'},
-                'acids': {'trend': 'stable', 'volatility': 'medium'},
-                'bases': {'trend': 'stable', 'volatility': 'low'}
-            },
-            'utilities': {
-                'electricity': {'trend': 'increasing', 'volatility': 'medium'},
-                'natural_gas': {'trend': 'volatile', 'volatility': 'high'},
-                'steam': {'trend': 'increasing', 'volatility': 'medium'}
-            }
-        }
+        return copy.deepcopy(MARKET_TRENDS)
+    
+    @cached_property
+    def _material_index(self) -> Dict[str, Dict]:
+        """
+        Material price records keyed by material name
+        """
+        return {record['material_name']: record for record in self.material_prices.to_dict('records')}
+    
+    @cached_property
+    def _utility_index(self) -> Dict[str, Dict]:
+        """
+        Utility cost records keyed by utility type
+        """
+        return {record['utility_type']: record for record in self.utility_costs.to_dict('records')}
+    
+    def rebuild_price_indexes(self):
+        """
+        Re-index the price tables and drop cached aggregates after the tables change
+        """
+        self.__dict__.pop('_material_index', None)
+        self.__dict__.pop('_utility_index', None)
+        self.invalidate_market_summary()
+    
+    def refresh_clock(self):
+        """
+        Update the timestamp attached to prices and costs as 'last_updated'
+        """
+        self._clock_read_at = time.monotonic()
+        self._now_iso = datetime.now().isoformat()
+    
+    def _timestamp(self) -> str:
+        """
+        Current ISO timestamp, formatted at most once per CLOCK_TTL_SECONDS
+        """
+        if time.monotonic() - self._clock_read_at >= CLOCK_TTL_SECONDS:
+            self.refresh_clock()
+        return self._now_iso
     
     def get_material_price(self, material_name: str) -> Optional[Dict]:
         """
@@ -103,29 +216,22 @@ class MarketDataProvider:
         Returns:
             Dictionary with price information
         """
-        material_row = self.material_prices[
-            self.material_prices['material_name'] == material_name.lower()
-        ]
+        material_record = self._material_index.get(material_name.lower())
         
-        if material_row.empty:
+        if material_record is None:
             return None
         
-        material_data = material_row.iloc[0].to_dict()
+        material_data = dict(material_record)
         
         # Add price volatility adjustment
         base_price = material_data['price_usd_per_kg']
         volatility = material_data['volatility']
         
-        # Simulate price range based on volatility
-        if volatility == 'low':
-            price_range = (base_price * 0.95, base_price * 1.05)
-        elif volatility == 'medium':
-            price_range = (base_price * 0.85, base_price * 1.15)
-        else:  # high volatility
-            price_range = (base_price * 0.70, base_price * 1.30)
+        # Simulate price range based on volatility; unknown levels are treated as high
+        low_multiplier, high_multiplier = VOLATILITY_PRICE_RANGE.get(volatility, VOLATILITY_PRICE_RANGE['high'])
         
-        material_data['price_range'] = price_range
-        material_data['last_updated'] = datetime.now().isoformat()
+        material_data['price_range'] = (base_price * low_multiplier, base_price * high_multiplier)
+        material_data['last_updated'] = self._timestamp()
         
         return material_data
     
@@ -140,14 +246,11 @@ class MarketDataProvider:
         Returns:
             Dictionary with utility cost information
         """
-        utility_row = self.utility_costs[
-            self.utility_costs['utility_type'] == utility_type.lower()
-        ]
+        utility_data = self._utility_index.get(utility_type.lower())
         
-        if utility_row.empty:
+        if utility_data is None:
             return None
         
-        utility_data = utility_row.iloc[0].to_dict()
         location_key = location.lower().replace(' ', '_').replace('-', '_')
         
         if location_key not in utility_data:
@@ -161,7 +264,7 @@ class MarketDataProvider:
             'cost': cost,
             'unit': utility_data['unit'],
             'currency': 'USD',
-            'last_updated': datetime.now().isoformat()
+            'last_updated': self._timestamp()
         }
     
     def get_price_forecast(self, material_name: str, years: int = 5) -> Dict:
@@ -187,20 +290,11 @@ class MarketDataProvider:
         forecast_years = list(range(1, years + 1))
         
         # Base trend assumptions
-        if volatility == 'low':
-            annual_growth = np.random.normal(0.02, 0.01, years)  # 2% ± 1%
-        elif volatility == 'medium':
-            annual_growth = np.random.normal(0.03, 0.02, years)  # 3% ± 2%
-        else:  # high volatility
-            annual_growth = np.random.normal(0.04, 0.03, years)  # 4% ± 3%
-        
-        # Calculate forecasted prices
-        forecasted_prices = []
-        current_price = base_price
+        growth_mean, growth_std = VOLATILITY_GROWTH.get(volatility, VOLATILITY_GROWTH['high'])
+        annual_growth = np.random.normal(growth_mean, growth_std, years)
         
-        for growth_rate in annual_growth:
-            current_price = current_price * (1 + growth_rate)
-            forecasted_prices.append(current_price)
+        # Calculate forecasted prices by compounding the annual growth
+        forecasted_prices = (base_price * np.cumprod(1.0 + annual_growth)).tolist()
         
         return {
             'material_name': material_name,
@@ -238,15 +332,15 @@ class MarketDataProvider:
         Returns:
             Dictionary with escalated costs
         """
-        escalated_costs = []
+        escalation_years = np.arange(1, years + 1)
+        escalation_factors = (1 + escalation_rate) ** escalation_years
+        escalated = base_cost * escalation_factors
         
-        for year in range(1, years + 1):
-            escalated_cost = base_cost * (1 + escalation_rate) ** year
-            escalated_costs.append({
-                'year': year,
-                'escalated_cost': escalated_cost,
-                'escalation_factor': (1 + escalation_rate) ** year
-            })
+        escalated_costs = [
+            {'year': year, 'escalated_cost': escalated_cost, 'escalation_factor': escalation_factor}
+            for year, escalated_cost, escalation_factor in zip(
+                escalation_years.tolist(), escalated.tolist(), escalation_factors.tolist())
+        ]
         
         return {
             'base_cost': base_cost,
@@ -283,13 +377,24 @@ class MarketDataProvider:
         Returns:
             Dictionary with market summary
         """
-        avg_prices = self.material_prices.groupby('category')['price_usd_per_kg'].mean()
-        price_volatility = self.material_prices['volatility'].value_counts()
+        if self._market_summary_cache is None:
+            avg_prices = self.material_prices.groupby('category', observed=True)['price_usd_per_kg'].mean()
+            price_volatility = self.material_prices['volatility'].value_counts()
+            
+            self._market_summary_cache = {
+                'total_materials': len(self.material_prices),
+                'categories': self.material_prices['category'].unique().tolist(),
+                'average_prices_by_category': avg_prices.to_dict(),
+                'volatility_distribution': price_volatility.to_dict()
+            }
         
         return {
-            'total_materials': len(self.material_prices),
-            'categories': self.material_prices['category'].unique().tolist(),
-            'average_prices_by_category': avg_prices.to_dict(),
-            'volatility_distribution': price_volatility.to_dict(),
-            'last_updated': datetime.now().isoformat()
+            **self._market_summary_cache,
+            'last_updated': self._timestamp()
         }
+    
+    def invalidate_market_summary(self):
+        """
+        Drop the cached market summary after the material price table changes
+        """
+        self._market_summary_cache = None
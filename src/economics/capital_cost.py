@@ -6,7 +6,38 @@ Capital cost estimation for chemical processes
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
-from ..utils.calculations import equipment_cost_scaling, cepci_cost_update
+from dataclasses import dataclass
+from ..utils.calculations import equipment_cost_scaling, cepci_cost_update, scaled_equipment_cost
+
+CAPITAL_BREAKDOWN_KEYS = ('installed_equipment_cost', 'engineering_cost', 'construction_cost',
+                          'contingency', 'fixed_capital_investment', 'working_capital',
+                          'total_capital_investment')
+
+def _capital_multipliers(plant_factors: Dict[str, float]) -> np.ndarray:
+    """
+    Multipliers of the installed cost for each entry of CAPITAL_BREAKDOWN_KEYS
+    """
+    engineering = plant_factors['engineering']
+    construction = plant_factors['construction']
+    fixed_capital = 1 + engineering + construction
+    contingency = fixed_capital * plant_factors['contingency']
+    total_fixed_capital = fixed_capital + contingency
+    working_capital = total_fixed_capital * plant_factors['working_capital']
+    
+    return np.array([1.0, engineering, construction, contingency, total_fixed_capital,
+                     working_capital, total_fixed_capital + working_capital])
+
+@dataclass(slots=True)
+class EquipmentCosts:
+    """
+    Purchased costs of an equipment list, stored column-wise
+    """
+    equipment_ids: Tuple[str, ...]
+    equipment_types: Tuple[str, ...]
+    unit_costs: np.ndarray
+    quantities: np.ndarray
+    total_costs: np.ndarray
+    total_equipment_cost: float
 
 class CapitalCostEstimator:
     """
@@ -16,6 +47,9 @@ class CapitalCostEstimator:
     def __init__(self):
         self.equipment_database = self._load_equipment_database()
         self.installation_factors = self._get_installation_factors()
+        self.plant_factors = self._get_plant_factors()
+        self.capital_multipliers = {plant_type: _capital_multipliers(factors)
+                                    for plant_type, factors in self.plant_factors.items()}
         self.current_cepci = 850  # Approximate 2024 CEPCI
     
     def _load_equipment_database(self) -> Dict:
@@ -69,6 +103,25 @@ class CapitalCostEstimator:
             'default': 3.0
         }
     
+    def _get_plant_factors(self) -> Dict:
+        """
+        Get indirect cost factors for different plant types
+        """
+        return {
+            'chemical': {
+                'engineering': 0.15,
+                'construction': 0.20,
+                'contingency': 0.15,
+                'working_capital': 0.10
+            },
+            'pharmaceutical': {
+                'engineering': 0.20,
+                'construction': 0.25,
+                'contingency': 0.20,
+                'working_capital': 0.15
+            }
+        }
+    
     def estimate_equipment_cost(self, equipment_type: str, capacity: float, 
                               material: str = 'carbon_steel', year: int = 2024) -> float:
         """
@@ -105,121 +158,108 @@ class CapitalCostEstimator:
         
         return current_cost
     
-    def calculate_total_equipment_cost(self, equipment_list: List[Dict]) -> Dict[str, float]:
+    def calculate_equipment_costs_columnar(self, equipment_columns: Dict[str, List]) -> EquipmentCosts:
         """
-        Calculate total equipment cost for a list of equipment
+        Calculate total equipment cost for equipment stored column-wise
         
         Args:
-            equipment_list: List of equipment dictionaries with type, capacity, material
+            equipment_columns: Dictionary of equal-length columns 'type', 'capacity',
+                               'material', 'quantity' and 'id'
         
         Returns:
-            Dictionary with equipment costs breakdown
+            Equipment costs breakdown
         """
-        equipment_costs = {}
-        total_equipment_cost = 0
+        equipment_types = tuple(equipment_columns['type'])
+        n_items = len(equipment_types)
         
-        for equipment in equipment_list:
-            equipment_type = equipment['type']
-            capacity = equipment['capacity']
-            material = equipment.get('material', 'carbon_steel')
-            quantity = equipment.get('quantity', 1)
-            
-            unit_cost = self.estimate_equipment_cost(equipment_type, capacity, material)
-            total_cost = unit_cost * quantity
-            
-            equipment_costs[f"{equipment_type}_{equipment.get('id', '')}"] = {
-                'unit_cost': unit_cost,
-                'quantity': quantity,
-                'total_cost': total_cost
-            }
+        # Gather correlation parameters per item, then cost all items in one pass
+        capacities = np.asarray(equipment_columns['capacity'], dtype=np.float64)
+        quantities = np.asarray(equipment_columns['quantity'])
+        base_costs = np.empty(n_items)
+        base_capacities = np.empty(n_items)
+        scaling_factors = np.empty(n_items)
+        material_factors = np.empty(n_items)
+        
+        for i, (equipment_type, material) in enumerate(zip(equipment_types, equipment_columns['material'])):
+            if equipment_type not in self.equipment_database:
+                raise ValueError(f"Equipment type '{equipment_type}' not found in database")
             
-            total_equipment_cost += total_cost
+            equipment_data = self.equipment_database[equipment_type]
+            base_costs[i] = equipment_data['base_cost']
+            base_capacities[i] = equipment_data['base_capacity']
+            scaling_factors[i] = equipment_data['scaling_factor']
+            material_factors[i] = equipment_data['material_factor'].get(material, 1.0)
+        
+        if np.any(capacities <= 0):
+            raise ValueError("Error scaling equipment cost: Capacities must be positive")
+        
+        # Costs are referenced to base year 2020 with CEPCI 596
+        base_year_cepci = 596
+        unit_costs = scaled_equipment_cost(capacities, base_costs, base_capacities, scaling_factors,
+                                           material_factors, self.current_cepci / base_year_cepci)
+        total_costs = unit_costs * quantities
         
-        equipment_costs['total_equipment_cost'] = total_equipment_cost
-        return equipment_costs
+        return EquipmentCosts(
+            equipment_ids=tuple(f"{equipment_type}_{equipment_id}" for equipment_type, equipment_id
+                                in zip(equipment_types, equipment_columns['id'])),
+            equipment_types=equipment_types,
+            unit_costs=unit_costs,
+            quantities=quantities,
+            total_costs=total_costs,
+            total_equipment_cost=float(total_costs.sum())
+        )
     
-    def calculate_installed_cost(self, equipment_costs: Dict[str, float]) -> Dict[str, float]:
+    def calculate_installed_cost(self, equipment_costs: EquipmentCosts) -> Dict[str, float]:
         """
         Calculate installed equipment costs
         """
-        installed_costs = {}
-        total_installed_cost = 0
-        
-        for equipment_id, cost_data in equipment_costs.items():
-            if equipment_id == 'total_equipment_cost':
-                continue
-                
-            equipment_type = equipment_id.split('_')[0]
-            installation_factor = self.installation_factors.get(equipment_type, 
-                                                              self.installation_factors['default'])
-            
-            if isinstance(cost_data, dict):
-                equipment_cost = cost_data['total_cost']
-            else:
-                equipment_cost = cost_data
-            
-            installed_cost = equipment_cost * installation_factor
-            installed_costs[equipment_id] = installed_cost
-            total_installed_cost += installed_cost
-        
-        installed_costs['total_installed_cost'] = total_installed_cost
+        installed = equipment_costs.total_costs * self._installation_factor_array(equipment_costs.equipment_types)
+        installed_costs = dict(zip(equipment_costs.equipment_ids, installed.tolist()))
+        installed_costs['total_installed_cost'] = float(installed.sum())
         return installed_costs
     
+    def _installation_factor_array(self, equipment_types: Tuple[str, ...]) -> np.ndarray:
+        """
+        Installation factor of each item, from the per-type factors
+        """
+        default_factor = self.installation_factors['default']
+        return np.fromiter(
+            (self.installation_factors.get(equipment_type, default_factor) for equipment_type in equipment_types),
+            dtype=np.float64, count=len(equipment_types)
+        )
+    
     def estimate_total_capital_investment(self, total_installed_cost: float, 
-                                        plant_type: str = 'chemical') -> Dict[str, float]:
+                                        plant_type: str = 'chemical',
+                                        total_equipment_cost: Optional[float] = None) -> Dict[str, float]:
         """
         Estimate total capital investment including indirect costs
         
         Args:
             total_installed_cost: Total installed equipment cost
             plant_type: Type of plant (chemical, pharmaceutical, etc.)
+            total_equipment_cost: Purchased equipment cost; when given, the equipment
+                                  cost fraction and installation factor are included
         
         Returns:
             Capital cost breakdown
         """
-        # Factors based on plant type
-        factors = {
-            'chemical': {
-                'engineering': 0.15,
-                'construction': 0.20,
-                'contingency': 0.15,
-                'working_capital': 0.10
-            },
-            'pharmaceutical': {
-                'engineering': 0.20,
-                'construction': 0.25,
-                'contingency': 0.20,
-                'working_capital': 0.15
-            }
-        }
-        
-        plant_factors = factors.get(plant_type, factors['chemical'])
-        
-        # Calculate capital cost components
-        engineering_cost = total_installed_cost * plant_factors['engineering']
-        construction_cost = total_installed_cost * plant_factors['construction']
-        
-        # Fixed capital investment
-        fixed_capital = total_installed_cost + engineering_cost + construction_cost
-        
-        # Contingency
-        contingency = fixed_capital * plant_factors['contingency']
+        # All components are fixed multiples of the installed cost for a plant type
+        components = self._plant_multipliers(plant_type) * total_installed_cost
+        capital_breakdown = dict(zip(CAPITAL_BREAKDOWN_KEYS, components.tolist()))
         
-        # Total fixed capital
-        total_fixed_capital = fixed_capital + contingency
+        if total_equipment_cost is not None:
+            total_capital_investment = capital_breakdown['total_capital_investment']
+            capital_breakdown['equipment_fraction'] = (
+                total_equipment_cost / total_capital_investment * 100 if total_capital_investment > 0 else 0.0
+            )
+            capital_breakdown['installation_factor'] = (
+                total_installed_cost / total_equipment_cost if total_equipment_cost > 0 else 0.0
+            )
         
-        # Working capital
-        working_capital = total_fixed_capital * plant_factors['working_capital']
-        
-        # Total capital investment
-        total_capital_investment = total_fixed_capital + working_capital
-        
-        return {
-            'installed_equipment_cost': total_installed_cost,
-            'engineering_cost': engineering_cost,
-            'construction_cost': construction_cost,
-            'contingency': contingency,
-            'fixed_capital_investment': total_fixed_capital,
-            'working_capital': working_capital,
-            'total_capital_investment': total_capital_investment
-        }
+        return capital_breakdown
+    
+    def _plant_multipliers(self, plant_type: str) -> np.ndarray:
+        """
+        Capital cost multipliers for a plant type, falling back to a chemical plant
+        """
+        return self.capital_multipliers.get(plant_type, self.capital_multipliers['chemical'])
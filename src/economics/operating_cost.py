@@ -3,9 +3,77 @@
 Operating cost calculations for chemical processes
 """
 
-import pandas as pd
-import numpy as np
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+# Utility prices (can be loaded from database)
+UTILITY_PRICES = MappingProxyType({
+    'electricity': 0.08,  # $/kWh
+    'steam_low_pressure': 15.0,  # $/ton
+    'steam_medium_pressure': 18.0,  # $/ton
+    'steam_high_pressure': 22.0,  # $/ton
+    'cooling_water': 0.05,  # $/m3
+    'process_water': 0.50,  # $/m3
+    'natural_gas': 8.0,  # $/MMBtu
+    'compressed_air': 0.20  # $/1000 ft3
+})
+
+# Direct cost categories the overhead is charged on
+DIRECT_COST_CATEGORIES = ('raw_materials', 'utilities', 'labor', 'maintenance')
+
+# Optional cost input, its direct cost category and the method costing it, in breakdown order
+OPERATING_COST_STEPS = (
+    ('raw_materials', 'raw_materials', '_raw_material_costs'),
+    ('utilities', 'utilities', '_utility_costs'),
+    ('labor_requirements', 'labor', '_labor_costs'),
+    ('fixed_capital_investment', 'maintenance', '_maintenance_cost')
+)
+
+# Cost input keys that change which steps a calculation runs
+OPERATING_COST_STEP_KEYS = frozenset(input_key for input_key, _, _ in OPERATING_COST_STEPS)
+
+# Labor rates by position
+LABOR_RATES = MappingProxyType({
+    'operator': 35.0,  # $/hour
+    'supervisor': 50.0,  # $/hour
+    'maintenance': 40.0,  # $/hour
+    'engineer': 60.0,  # $/hour
+})
+
+@dataclass(slots=True)
+class OperatingCosts:
+    """
+    Annual operating cost totals, with the itemized costs of each category
+    """
+    raw_material_cost: float
+    utility_cost: float
+    labor_cost: float
+    maintenance_cost: float
+    overhead_cost: float
+    total_annual_operating_cost: float
+    breakdown: Dict[str, Dict]
+    
+    def to_dict(self) -> Dict:
+        """
+        Flat operating cost breakdown, with each category's items followed by its total
+        """
+        operating_costs = {}
+        for category, total_key, total in (
+            ('raw_materials', 'total_raw_material_cost', self.raw_material_cost),
+            ('utilities', 'total_utility_cost', self.utility_cost),
+            ('labor', 'total_labor_cost', self.labor_cost),
+            ('maintenance', 'maintenance_cost', self.maintenance_cost)
+        ):
+            # Categories whose input was missing were never costed and get no keys
+            if category in self.breakdown:
+                operating_costs.update(self.breakdown[category])
+                operating_costs[total_key] = total
+        
+        operating_costs.update(self.breakdown.get('overhead', {}))
+        operating_costs['total_overhead_cost'] = self.overhead_cost
+        operating_costs['total_annual_operating_cost'] = self.total_annual_operating_cost
+        return operating_costs
 
 class OperatingCostCalculator:
     """
@@ -15,32 +83,20 @@ class OperatingCostCalculator:
     def __init__(self):
         self.utility_prices = self._get_utility_prices()
         self.labor_rates = self._get_labor_rates()
+        # Step input key set -> specialized total operating cost calculation
+        self._operating_cost_calculations = {}
     
-    def _get_utility_prices(self) -> Dict[str, float]:
+    def _get_utility_prices(self) -> Mapping[str, float]:
         """
         Get utility prices (can be loaded from database)
         """
-        return {
-            'electricity': 0.08,  # $/kWh
-            'steam_low_pressure': 15.0,  # $/ton
-            'steam_medium_pressure': 18.0,  # $/ton
-            'steam_high_pressure': 22.0,  # $/ton
-            'cooling_water': 0.05,  # $/m3
-            'process_water': 0.50,  # $/m3
-            'natural_gas': 8.0,  # $/MMBtu
-            'compressed_air': 0.20  # $/1000 ft3
-        }
+        return UTILITY_PRICES
     
-    def _get_labor_rates(self) -> Dict[str, float]:
+    def _get_labor_rates(self) -> Mapping[str, float]:
         """
         Get labor rates by position
         """
-        return {
-            'operator': 35.0,  # $/hour
-            'supervisor': 50.0,  # $/hour
-            'maintenance': 40.0,  # $/hour
-            'engineer': 60.0,  # $/hour
-        }
+        return LABOR_RATES
     
     def calculate_raw_material_costs(self, materials: List[Dict], production_rate: float,
                                    operating_hours: int) -> Dict[str, float]:
@@ -166,30 +222,34 @@ class OperatingCostCalculator:
         return fixed_capital_investment * maintenance_factor
     
     def calculate_overhead_costs(self, direct_costs: Dict[str, float],
-                               overhead_factor: float = 0.60) -> Dict[str, float]:
+                               overhead_factor: float = 0.60, detailed: bool = True) -> Dict[str, float]:
         """
         Calculate overhead costs
         
         Args:
             direct_costs: Dictionary of direct costs
             overhead_factor: Overhead factor (typically 50-80% of direct costs)
+            detailed: Include the breakdown by overhead category
         
         Returns:
             Overhead cost breakdown
         """
         total_direct_costs = sum(direct_costs.values())
         
-        overhead_costs = {
-            'administrative': total_direct_costs * 0.15,
-            'sales_marketing': total_direct_costs * 0.10,
-            'research_development': total_direct_costs * 0.05,
-            'general_overhead': total_direct_costs * (overhead_factor - 0.30)
-        }
+        overhead_costs = {}
+        if detailed:
+            overhead_costs = {
+                'administrative': total_direct_costs * 0.15,
+                'sales_marketing': total_direct_costs * 0.10,
+                'research_development': total_direct_costs * 0.05,
+                'general_overhead': total_direct_costs * (overhead_factor - 0.30)
+            }
         
-        overhead_costs['total_overhead_cost'] = sum(overhead_costs.values())
+        # The category fractions add up to the overhead factor
+        overhead_costs['total_overhead_cost'] = total_direct_costs * overhead_factor
         return overhead_costs
     
-    def calculate_total_operating_costs(self, cost_inputs: Dict) -> Dict[str, float]:
+    def calculate_total_operating_costs(self, cost_inputs: Dict) -> OperatingCosts:
         """
         Calculate total annual operating costs
         
@@ -197,54 +257,88 @@ class OperatingCostCalculator:
             cost_inputs: Dictionary with all cost inputs
         
         Returns:
-            Complete operating cost breakdown
+            Operating cost totals with the itemized breakdown
         """
-        operating_costs = {}
+        return self.compile_operating_cost_calculation(frozenset(cost_inputs))(cost_inputs)
+    
+    def compile_operating_cost_calculation(self, input_keys: frozenset) -> Callable[[Dict], OperatingCosts]:
+        """
+        Build a total operating cost calculation specialized to one set of input keys
         
-        # Raw material costs
-        if 'raw_materials' in cost_inputs:
-            material_costs = self.calculate_raw_material_costs(
-                cost_inputs['raw_materials'],
-                cost_inputs.get('production_rate', 1000),
-                cost_inputs.get('operating_hours', 8000)
-            )
-            operating_costs.update(material_costs)
-        
-        # Utility costs
-        if 'utilities' in cost_inputs:
-            utility_costs = self.calculate_utility_costs(cost_inputs['utilities'])
-            operating_costs.update(utility_costs)
-        
-        # Labor costs
-        if 'labor_requirements' in cost_inputs:
-            labor_costs = self.calculate_labor_costs(cost_inputs['labor_requirements'])
-            operating_costs.update(labor_costs)
-        
-        # Maintenance costs
-        if 'fixed_capital_investment' in cost_inputs:
-            maintenance_cost = self.calculate_maintenance_costs(
-                cost_inputs['fixed_capital_investment']
-            )
-            operating_costs['maintenance_cost'] = maintenance_cost
-        
-        # Calculate direct costs
-        direct_costs = {
-            'raw_materials': operating_costs.get('total_raw_material_cost', 0),
-            'utilities': operating_costs.get('total_utility_cost', 0),
-            'labor': operating_costs.get('total_labor_cost', 0),
-            'maintenance': operating_costs.get('maintenance_cost', 0)
-        }
-        
-        # Overhead costs
-        overhead_costs = self.calculate_overhead_costs(direct_costs)
-        operating_costs.update(overhead_costs)
-        
-        # Total operating cost
-        total_operating_cost = (
-            sum(direct_costs.values()) + 
-            overhead_costs['total_overhead_cost']
-        )
+        Batch callers whose cost inputs always carry the same keys can call the
+        returned function directly, skipping the per-call checks for optional inputs.
+        
+        Args:
+            input_keys: Keys present in the cost inputs
+        
+        Returns:
+            Function mapping cost inputs to their operating costs
+        """
+        # Keys no step depends on share a calculation, so at most one is built per step subset
+        input_keys = OPERATING_COST_STEP_KEYS.intersection(input_keys)
+        calculation = self._operating_cost_calculations.get(input_keys)
+        if calculation is not None:
+            return calculation
         
-        operating_costs['total_annual_operating_cost'] = total_operating_cost
+        cost_steps = tuple((category, getattr(self, step_name))
+                           for input_key, category, step_name in OPERATING_COST_STEPS
+                           if input_key in input_keys)
         
-        return operating_costs
+        def calculation(cost_inputs: Dict) -> OperatingCosts:
+            # Direct costs missing from the inputs stay zero
+            direct_costs = dict.fromkeys(DIRECT_COST_CATEGORIES, 0.0)
+            breakdown = {}
+            for category, cost_step in cost_steps:
+                breakdown[category], direct_costs[category] = cost_step(cost_inputs)
+            
+            # Overhead costs
+            overhead_costs = self.calculate_overhead_costs(direct_costs)
+            overhead_cost = overhead_costs.pop('total_overhead_cost')
+            breakdown['overhead'] = overhead_costs
+            
+            return OperatingCosts(
+                raw_material_cost=direct_costs['raw_materials'],
+                utility_cost=direct_costs['utilities'],
+                labor_cost=direct_costs['labor'],
+                maintenance_cost=direct_costs['maintenance'],
+                overhead_cost=overhead_cost,
+                total_annual_operating_cost=sum(direct_costs.values()) + overhead_cost,
+                breakdown=breakdown
+            )
+        
+        self._operating_cost_calculations[input_keys] = calculation
+        return calculation
+    
+    def _raw_material_costs(self, cost_inputs: Dict) -> Tuple[Dict, float]:
+        """
+        Itemized and total raw material costs
+        """
+        material_costs = self.calculate_raw_material_costs(
+            cost_inputs['raw_materials'],
+            cost_inputs.get('production_rate', 1000),
+            cost_inputs.get('operating_hours', 8000)
+        )
+        total_cost = material_costs.pop('total_raw_material_cost')
+        return material_costs, total_cost
+    
+    def _utility_costs(self, cost_inputs: Dict) -> Tuple[Dict, float]:
+        """
+        Itemized and total utility costs
+        """
+        utility_costs = self.calculate_utility_costs(cost_inputs['utilities'])
+        total_cost = utility_costs.pop('total_utility_cost')
+        return utility_costs, total_cost
+    
+    def _labor_costs(self, cost_inputs: Dict) -> Tuple[Dict, float]:
+        """
+        Itemized and total labor costs
+        """
+        labor_costs = self.calculate_labor_costs(cost_inputs['labor_requirements'])
+        total_cost = labor_costs.pop('total_labor_cost')
+        return labor_costs, total_cost
+    
+    def _maintenance_cost(self, cost_inputs: Dict) -> Tuple[Dict, float]:
+        """
+        Maintenance cost, which has no itemized breakdown
+        """
+        return {}, self.calculate_maintenance_costs(cost_inputs['fixed_capital_investment'])
@@ -6,7 +6,13 @@ Profitability analysis functions for chemical processes
 import numpy as np
 import pandas as pd
 from typing import List, Dict, Tuple
-from ..utils.calculations import calculate_npv, calculate_irr, calculate_payback_period, calculate_roi
+from ..utils.calculations import (calculate_discount_factors, calculate_npv, calculate_irr,
+                                   calculate_irrs, calculate_payback_period,
+                                   calculate_payback_periods, calculate_roi)
+
+# Parameters analyze_profitability cannot default
+MONTE_CARLO_REQUIRED = ('capital_investment', 'annual_revenue', 'annual_operating_costs',
+                        'project_lifetime', 'discount_rate')
 
 class ProfitabilityAnalyzer:
     """
@@ -16,26 +22,61 @@ class ProfitabilityAnalyzer:
     def __init__(self):
         self.results = {}
     
-    def calculate_annual_cash_flow(self, revenue: float, operating_costs: float, 
-                                 taxes: float = 0, depreciation: float = 0) -> float:
+    def calculate_annual_cash_flow(self, revenue, operating_costs, taxes=0, depreciation=0):
         """
         Calculate annual cash flow
         
         Args:
-            revenue: Annual revenue
-            operating_costs: Annual operating costs
-            taxes: Annual taxes
-            depreciation: Annual depreciation
+            revenue: Annual revenue, scalar or array
+            operating_costs: Annual operating costs, scalar or array
+            taxes: Annual taxes, scalar or array
+            depreciation: Annual depreciation, scalar or array
         
         Returns:
-            Annual cash flow
+            Annual cash flow, broadcast over the inputs
+        """
+        # After-tax income (revenue - costs - depreciation - taxes) plus the
+        # non-cash depreciation added back; depreciation only acts through taxes
+        return revenue - operating_costs - taxes
+    
+    def _cash_flow_matrix(self, capital_investment: np.ndarray, annual_revenue: np.ndarray,
+                          annual_operating_costs: np.ndarray, project_lifetime: np.ndarray,
+                          tax_rate: np.ndarray, salvage_value: np.ndarray) -> np.ndarray:
         """
-        gross_profit = revenue - operating_costs
-        taxable_income = gross_profit - depreciation
-        after_tax_income = taxable_income - taxes
-        cash_flow = after_tax_income + depreciation  # Add back non-cash depreciation
+        Build the cash flows of several scenarios as one matrix
         
-        return cash_flow
+        Args:
+            capital_investment: Initial capital investment per scenario
+            annual_revenue: Annual revenue per scenario
+            annual_operating_costs: Annual operating costs per scenario
+            project_lifetime: Project lifetime in whole years per scenario
+            tax_rate: Tax rate (decimal) per scenario
+            salvage_value: Salvage value per scenario
+        
+        Returns:
+            Array of shape (scenarios, max lifetime + 1); years past a
+            scenario's lifetime are zero
+        """
+        capital_investment = np.asarray(capital_investment, dtype=np.float64)
+        project_lifetime = np.asarray(project_lifetime)
+        salvage_value = np.broadcast_to(np.asarray(salvage_value, dtype=np.float64), capital_investment.shape)
+        
+        annual_depreciation = (capital_investment - salvage_value) / project_lifetime
+        taxable_income = np.asarray(annual_revenue) - np.asarray(annual_operating_costs) - annual_depreciation
+        taxes = np.maximum(0, taxable_income * tax_rate)
+        annual_cash_flow = self.calculate_annual_cash_flow(
+            np.asarray(annual_revenue), annual_operating_costs, taxes, annual_depreciation
+        )
+        
+        years = np.arange(1, project_lifetime.max() + 1)
+        cash_flows = np.zeros((capital_investment.size, years.size + 1))
+        cash_flows[:, 0] = -capital_investment
+        cash_flows[:, 1:] = np.where(years <= project_lifetime[:, None], annual_cash_flow[:, None], 0.0)
+        
+        # Add salvage value in each scenario's final year
+        cash_flows[np.arange(capital_investment.size), project_lifetime] += salvage_value
+        
+        return cash_flows
     
     def analyze_profitability(self, capital_investment: float, annual_revenue: float,
                             annual_operating_costs: float, project_lifetime: int,
@@ -57,29 +98,19 @@ class ProfitabilityAnalyzer:
             Dictionary with profitability metrics
         """
         try:
-            # Calculate annual depreciation (straight-line)
-            annual_depreciation = (capital_investment - salvage_value) / project_lifetime
-            
-            # Calculate annual cash flows
-            cash_flows = [-capital_investment]  # Initial investment (negative)
-            
-            for year in range(1, project_lifetime + 1):
-                gross_profit = annual_revenue - annual_operating_costs
-                taxable_income = gross_profit - annual_depreciation
-                taxes = max(0, taxable_income * tax_rate)
-                
-                # Cash flow = After-tax income + depreciation (non-cash)
-                after_tax_income = taxable_income - taxes
-                annual_cash_flow = after_tax_income + annual_depreciation
-                
-                # Add salvage value in final year
-                if year == project_lifetime:
-                    annual_cash_flow += salvage_value
-                
-                cash_flows.append(annual_cash_flow)
+            # Annual cash flows as a single-scenario row of the cash flow matrix
+            cash_flows = self._cash_flow_matrix(
+                np.array([capital_investment], dtype=np.float64),
+                annual_revenue,
+                annual_operating_costs,
+                np.array([project_lifetime]),
+                tax_rate,
+                salvage_value
+            )[0]
             
             # Calculate profitability metrics
-            npv = calculate_npv(cash_flows, discount_rate)
+            discount_factors = calculate_discount_factors(discount_rate, cash_flows.size)
+            npv = calculate_npv(cash_flows, discount_rate, discount_factors)
             irr = calculate_irr(cash_flows)
             payback_period = calculate_payback_period(capital_investment, cash_flows[1:])
             roi = calculate_roi(annual_revenue - annual_operating_costs, capital_investment)
@@ -89,19 +120,22 @@ class ProfitabilityAnalyzer:
             break_even_price = annual_operating_costs / (annual_revenue / 
                                                        (annual_revenue - annual_operating_costs)) if annual_revenue > annual_operating_costs else 0
             
-            self.results = {
+            results = {
                 'npv': npv,
                 'irr': irr * 100,  # Convert to percentage
                 'payback_period': payback_period,
                 'roi': roi,
                 'profitability_index': profitability_index,
-                'annual_cash_flow': cash_flows[1] if len(cash_flows) > 1 else 0,
+                'annual_cash_flow': float(cash_flows[1]) if len(cash_flows) > 1 else 0,
                 'total_revenue': annual_revenue * project_lifetime,
                 'total_costs': annual_operating_costs * project_lifetime,
                 'break_even_price': break_even_price
             }
             
-            return self.results
+            # The analyzer is shared across sessions, so callers get their own dict
+            # rather than self.results, which a concurrent call may replace
+            self.results = results
+            return results
             
         except Exception as e:
             raise ValueError(f"Error in profitability analysis: {str(e)}")
@@ -118,31 +152,51 @@ class ProfitabilityAnalyzer:
         Returns:
             DataFrame with sensitivity analysis results
         """
-        sensitivity_results = []
+        param_names = [name for name in sensitivity_ranges if name in base_parameters]
+        if not param_names:
+            return pd.DataFrame(columns=['parameter', 'change_percent', 'npv', 'irr', 'payback_period'])
         
-        for param_name, changes in sensitivity_ranges.items():
-            if param_name not in base_parameters:
-                continue
-                
-            base_value = base_parameters[param_name]
-            
-            for change_percent in changes:
-                new_value = base_value * (1 + change_percent / 100)
-                modified_params = base_parameters.copy()
-                modified_params[param_name] = new_value
-                
-                # Recalculate profitability
-                results = self.analyze_profitability(**modified_params)
-                
-                sensitivity_results.append({
-                    'parameter': param_name,
-                    'change_percent': change_percent,
-                    'npv': results['npv'],
-                    'irr': results['irr'],
-                    'payback_period': results['payback_period']
-                })
-        
-        return pd.DataFrame(sensitivity_results)
+        changes = [np.asarray(sensitivity_ranges[name], dtype=np.float64) for name in param_names]
+        change_percent = np.concatenate(changes)
+        parameter = np.repeat(param_names, [len(change) for change in changes])
+        
+        # One row per scenario, every parameter at its base value
+        scenarios = {
+            name: np.full(change_percent.size, float(value))
+            for name, value in base_parameters.items()
+        }
+        offset = 0
+        for name, change in zip(param_names, changes):
+            scenarios[name][offset:offset + change.size] *= 1 + change / 100
+            offset += change.size
+        
+        lifetimes = np.rint(scenarios['project_lifetime']).astype(int)
+        capital_investment = scenarios['capital_investment']
+        cash_flows = self._cash_flow_matrix(
+            capital_investment,
+            scenarios['annual_revenue'],
+            scenarios['annual_operating_costs'],
+            lifetimes,
+            scenarios.get('tax_rate', 0.3),
+            scenarios.get('salvage_value', 0)
+        )
+        
+        # Vectorized NPV across all scenarios; scenarios sharing a discount
+        # rate share one row of discount factors
+        rates, rate_index = np.unique(scenarios['discount_rate'], return_inverse=True)
+        discount_factors = calculate_discount_factors(rates, cash_flows.shape[1])
+        npv = calculate_npv(cash_flows, scenarios['discount_rate'], discount_factors[rate_index])
+        
+        irr = calculate_irrs(cash_flows) * 100
+        payback_period = calculate_payback_periods(capital_investment, cash_flows[:, 1:], lifetimes)
+        
+        return pd.DataFrame({
+            'parameter': parameter,
+            'change_percent': change_percent,
+            'npv': npv,
+            'irr': irr,
+            'payback_period': payback_period
+        })
     
     def monte_carlo_analysis(self, parameters: Dict[str, Dict], n_simulations: int = 1000) -> pd.DataFrame:
         """
@@ -155,34 +209,56 @@ class ProfitabilityAnalyzer:
         Returns:
             DataFrame with simulation results
         """
-        results = []
+        if any(name not in parameters for name in MONTE_CARLO_REQUIRED):
+            return pd.DataFrame()
         
-        for _ in range(n_simulations):
-            sim_params = {}
-            
-            for param_name, param_dist in parameters.items():
-                if param_dist['type'] == 'normal':
-                    value = np.random.normal(param_dist['mean'], param_dist['std'])
-                elif param_dist['type'] == 'triangular':
-                    value = np.random.triangular(param_dist['min'], param_dist['mode'], param_dist['max'])
-                elif param_dist['type'] == 'uniform':
-                    value = np.random.uniform(param_dist['min'], param_dist['max'])
+        # Draw every simulation of a parameter in one call, clamped to be non-negative;
+        # bounded distributions only need clamping when their lower bound is negative
+        samples = {}
+        for param_name, param_dist in parameters.items():
+            if param_dist['type'] == 'normal':
+                values = np.random.normal(param_dist['mean'], param_dist['std'], n_simulations)
+                np.maximum(0.0, values, out=values)
+            elif param_dist['type'] in ('triangular', 'uniform'):
+                if param_dist['type'] == 'triangular':
+                    values = np.random.triangular(param_dist['min'], param_dist['mode'], param_dist['max'], n_simulations)
                 else:
-                    value = param_dist['mean']
-                
-                sim_params[param_name] = max(0, value)  # Ensure positive values
+                    values = np.random.uniform(param_dist['min'], param_dist['max'], n_simulations)
+                if param_dist['min'] < 0:
+                    np.maximum(0.0, values, out=values)
+            else:
+                values = np.full(n_simulations, max(0.0, float(param_dist['mean'])))
             
-            # Calculate profitability for this simulation
-            try:
-                sim_results = self.analyze_profitability(**sim_params)
-                results.append({
-                    'simulation': len(results) + 1,
-                    'npv': sim_results['npv'],
-                    'irr': sim_results['irr'],
-                    'payback_period': sim_results['payback_period'],
-                    'roi': sim_results['roi']
-                })
-            except:
-                continue  # Skip failed simulations
-        
-        return pd.DataFrame(results)
+            samples[param_name] = values
+        
+        # Skip simulations that cannot be analyzed (no investment or no operating years)
+        lifetimes = np.rint(samples['project_lifetime']).astype(int)
+        valid = (samples['capital_investment'] > 0) & (lifetimes > 0)
+        if not valid.any():
+            return pd.DataFrame()
+        
+        samples = {name: values[valid] for name, values in samples.items()}
+        lifetimes = lifetimes[valid]
+        
+        capital_investment = samples['capital_investment']
+        cash_flows = self._cash_flow_matrix(
+            capital_investment,
+            samples['annual_revenue'],
+            samples['annual_operating_costs'],
+            lifetimes,
+            samples.get('tax_rate', 0.3),
+            samples.get('salvage_value', 0)
+        )
+        
+        npv = calculate_npv(cash_flows, samples['discount_rate'])
+        irr = calculate_irrs(cash_flows) * 100
+        payback_period = calculate_payback_periods(capital_investment, cash_flows[:, 1:], lifetimes)
+        roi = (samples['annual_revenue'] - samples['annual_operating_costs']) / capital_investment * 100
+        
+        return pd.DataFrame({
+            'simulation': np.arange(1, capital_investment.size + 1),
+            'npv': npv,
+            'irr': irr,
+            'payback_period': payback_period,
+            'roi': roi
+        })
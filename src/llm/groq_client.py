@@ -4,36 +4,90 @@ Groq API integration for ChemEconAI
 """
 
 import os
+from functools import lru_cache
 from groq import Groq
 import streamlit as st
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import json
 
-class ProcessEconomicsGroq:
+# Groq API key once found; a missing key is looked up again on the next call
+_resolved_api_key: Optional[str] = None
+
+def resolve_api_key() -> Optional[str]:
     """
-    Groq AI client for chemical process economics insights
+    Groq API key from the environment or Streamlit secrets, kept once found
     """
+    global _resolved_api_key
+    if _resolved_api_key:
+        return _resolved_api_key
     
-    def __init__(self):
-        self.client = Groq(
-            api_key=os.getenv("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") or st.secrets.get("GROQ_API_KEY")
-        )
-        self.model = "llama3-8b-8192"  # Fast and capable model
-        
-    def get_process_advice(self, process_data: Dict, question: str) -> str:
-        """
-        Get AI advice on process economics
-        
-        Args:
-            process_data: Dictionary with process parameters
-            question: User's question
-            
-        Returns:
-            AI response with advice
-        """
-        context = self._build_process_context(process_data)
-        
-        prompt = f"""
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        try:
+            api_key = st.secrets.get("GROQ_API_KEY")
+        except FileNotFoundError:
+            # No secrets.toml (StreamlitSecretNotFoundError), e.g. local development
+            api_key = None
+    
+    if api_key:
+        _resolved_api_key = api_key
+    return api_key
+
+@lru_cache(maxsize=None)
+def _groq_client(api_key: Optional[str]) -> Groq:
+    """
+    Shared Groq client per API key, so every instance reuses one HTTP connection pool
+    """
+    return Groq(api_key=api_key)
+
+# System messages are shared by every request of their kind
+PROCESS_ADVICE_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an expert chemical process economics consultant with deep industry knowledge."
+}
+
+ECONOMICS_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are analyzing chemical process economics. Be specific about industry benchmarks and provide actionable insights."
+}
+
+COST_OPTIMIZATION_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a cost optimization expert for chemical processes with knowledge of proven industry strategies."
+}
+
+EXECUTIVE_SUMMARY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are writing for C-suite executives. Be professional, concise, and decisive."
+}
+
+ALTERNATIVES_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are comparing investment alternatives. Consider both quantitative and qualitative factors."
+}
+
+# Process context lines, in the order they are sent
+PROCESS_CONTEXT_FIELDS = (
+    ('process_type', "Process Type: {}"),
+    ('production_rate', "Production Rate: {} tons/year"),
+    ('raw_materials', "Raw Materials: {}"),
+    ('products', "Products: {}"),
+    ('investment', "Total Investment: ${:,.2f}"),
+    ('operating_hours', "Operating Hours: {} hours/year")
+)
+
+def _context_value(key: str, value):
+    """
+    Process data value as shown in the context; material and product lists are joined by name
+    """
+    if key == 'raw_materials':
+        return ', '.join(mat if isinstance(mat, str) else mat.get('name', 'Unknown') for mat in value)
+    if key == 'products':
+        return ', '.join(value)
+    return value
+
+# Prompt templates, filled with str.format
+PROCESS_ADVICE_PROMPT = """
 You are an expert Chemical Process Economics advisor with 20+ years of industry experience.
 
 PROCESS DATA:
@@ -50,38 +104,17 @@ Please provide:
 
 Be concise, practical, and data-driven. Use specific chemical engineering terminology.
 """
-        
-        try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert chemical process economics consultant with deep industry knowledge."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                model=self.model,
-                temperature=0.3,
-                max_tokens=1024
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            return f"⚠️ Error getting AI advice: {str(e)}"
-    
-    def analyze_economics(self, calculations: Dict) -> str:
-        """
-        Analyze economic calculations and provide insights
-        """
-        prompt = f"""
+
+ECONOMICS_PROMPT = """
 Analyze these chemical process economics calculations:
 
-NPV: ${calculations.get('npv', 0):,.2f}
-IRR: {calculations.get('irr', 0):.2f}%
-Payback Period: {calculations.get('payback', 0):.1f} years
-ROI: {calculations.get('roi', 0):.2f}%
-Capital Cost: ${calculations.get('capex', 0):,.2f}
-Annual Operating Cost: ${calculations.get('opex', 0):,.2f}
-Annual Revenue: ${calculations.get('revenue', 0):,.2f}
+NPV: ${npv:,.2f}
+IRR: {irr:.2f}%
+Payback Period: {payback:.1f} years
+ROI: {roi:.2f}%
+Capital Cost: ${capex:,.2f}
+Annual Operating Cost: ${opex:,.2f}
+Annual Revenue: ${revenue:,.2f}
 
 Provide:
 1. Overall investment attractiveness (1-10 scale with reasoning)
@@ -92,31 +125,10 @@ Provide:
 
 Be specific and actionable in your analysis.
 """
-        
-        try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are analyzing chemical process economics. Be specific about industry benchmarks and provide actionable insights."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                model=self.model,
-                temperature=0.2,
-                max_tokens=1024
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            return f"⚠️ Error analyzing economics: {str(e)}"
-    
-    def optimize_costs(self, cost_breakdown: Dict) -> str:
-        """
-        Suggest cost optimization strategies
-        """
-        prompt = f"""
+
+COST_OPTIMIZATION_PROMPT = """
 Cost breakdown for chemical process:
-{json.dumps(cost_breakdown, indent=2)}
+{cost_breakdown}
 
 Identify the top 5 cost optimization opportunities with:
 1. Specific cost category to target
@@ -133,37 +145,16 @@ Focus on proven chemical industry strategies. Consider:
 - Utility optimization
 - Automation opportunities
 """
-        
-        try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are a cost optimization expert for chemical processes with knowledge of proven industry strategies."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                model=self.model,
-                temperature=0.3,
-                max_tokens=1024
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            return f"⚠️ Error optimizing costs: {str(e)}"
-    
-    def generate_executive_summary(self, project_data: Dict) -> str:
-        """
-        Generate executive summary for investment decision
-        """
-        prompt = f"""
+
+EXECUTIVE_SUMMARY_PROMPT = """
 Generate a professional executive summary for this chemical process investment:
 
-Project: {project_data.get('name', 'Chemical Process Investment')}
-Investment: ${project_data.get('investment', 0):,.2f}
-NPV: ${project_data.get('npv', 0):,.2f}
-IRR: {project_data.get('irr', 0):.1f}%
-Payback: {project_data.get('payback', 0):.1f} years
-Production: {project_data.get('production_rate', 0)} tons/year
+Project: {name}
+Investment: ${investment:,.2f}
+NPV: ${npv:,.2f}
+IRR: {irr:.1f}%
+Payback: {payback:.1f} years
+Production: {production_rate} tons/year
 
 Create a 200-300 word executive summary for C-suite decision makers covering:
 1. Project overview and strategic fit
@@ -174,37 +165,16 @@ Create a 200-300 word executive summary for C-suite decision makers covering:
 
 Write professionally for executives making multi-million dollar decisions.
 """
-        
-        try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are writing for C-suite executives. Be professional, concise, and decisive."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                model=self.model,
-                temperature=0.2,
-                max_tokens=512
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            return f"⚠️ Error generating summary: {str(e)}"
-    
-    def compare_alternatives(self, alternatives: List[Dict]) -> str:
-        """
-        Compare multiple process alternatives
-        """
-        comparison_data = ""
-        for i, alt in enumerate(alternatives):
-            comparison_data += f"\nAlternative {i+1}: {alt.get('name', f'Option {i+1}')}\n"
-            comparison_data += f"- NPV: ${alt.get('npv', 0):,.2f}\n"
-            comparison_data += f"- IRR: {alt.get('irr', 0):.1f}%\n"
-            comparison_data += f"- Payback: {alt.get('payback', 0):.1f} years\n"
-            comparison_data += f"- CAPEX: ${alt.get('capex', 0):,.2f}\n"
-        
-        prompt = f"""
+
+ALTERNATIVE_ENTRY = """
+Alternative {number}: {name}
+- NPV: ${npv:,.2f}
+- IRR: {irr:.1f}%
+- Payback: {payback:.1f} years
+- CAPEX: ${capex:,.2f}
+"""
+
+ALTERNATIVES_PROMPT = """
 Compare these chemical process alternatives:
 {comparison_data}
 
@@ -217,16 +187,166 @@ Provide:
 
 Consider both financial metrics and strategic factors.
 """
+
+class ProcessEconomicsGroq:
+    """
+    Groq AI client for chemical process economics insights
+    """
+    
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key or resolve_api_key()
+        self.client = _groq_client(self.api_key)
+        self.model = "llama3-8b-8192"  # Fast and capable model
+        
+    def get_process_advice(self, process_data: Dict, question: str) -> str:
+        """
+        Get AI advice on process economics
+        
+        Args:
+            process_data: Dictionary with process parameters
+            question: User's question
+            
+        Returns:
+            AI response with advice
+        """
+        try:
+            response = self.client.chat.completions.create(**self._process_advice_request(process_data, question))
+            return response.choices[0].message.content
+        except Exception as e:
+            return f"⚠️ Error getting AI advice: {str(e)}"
+    
+    def stream_process_advice(self, process_data: Dict, question: str) -> Iterator[str]:
+        """
+        Stream AI advice on process economics as it is generated
+        
+        Args:
+            process_data: Dictionary with process parameters
+            question: User's question
+            
+        Returns:
+            Iterator over chunks of the AI response, suitable for st.write_stream
+        """
+        try:
+            stream = self.client.chat.completions.create(
+                **self._process_advice_request(process_data, question), stream=True
+            )
+            for chunk in stream:
+                yield chunk.choices[0].delta.content or ""
+        except Exception as e:
+            yield f"⚠️ Error getting AI advice: {str(e)}"
+    
+    def _process_advice_request(self, process_data: Dict, question: str) -> Dict:
+        """
+        Chat completion request for get_process_advice
+        """
+        context = self._build_process_context(process_data)
+        prompt = PROCESS_ADVICE_PROMPT.format(context=context, question=question)
+        
+        return {
+            'messages': [PROCESS_ADVICE_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+            'model': self.model,
+            'temperature': 0.3,
+            'max_tokens': 1024
+        }
+    
+    def analyze_economics(self, calculations: Dict) -> str:
+        """
+        Analyze economic calculations and provide insights
+        """
+        try:
+            response = self.client.chat.completions.create(**self._economics_request(calculations))
+            return response.choices[0].message.content
+        except Exception as e:
+            return f"⚠️ Error analyzing economics: {str(e)}"
+    
+    def _economics_request(self, calculations: Dict) -> Dict:
+        """
+        Chat completion request for analyze_economics
+        """
+        prompt = ECONOMICS_PROMPT.format(**{
+            key: calculations.get(key, 0) for key in ('npv', 'irr', 'payback', 'roi', 'capex', 'opex', 'revenue')
+        })
+        
+        return {
+            'messages': [ECONOMICS_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+            'model': self.model,
+            'temperature': 0.2,
+            'max_tokens': 1024
+        }
+    
+    def optimize_costs(self, cost_breakdown: Dict) -> str:
+        """
+        Suggest cost optimization strategies
+        """
+        try:
+            response = self.client.chat.completions.create(**self._cost_optimization_request(cost_breakdown))
+            return response.choices[0].message.content
+        except Exception as e:
+            return f"⚠️ Error optimizing costs: {str(e)}"
+    
+    def _cost_optimization_request(self, cost_breakdown: Dict) -> Dict:
+        """
+        Chat completion request for optimize_costs
+        """
+        prompt = COST_OPTIMIZATION_PROMPT.format(cost_breakdown=json.dumps(cost_breakdown, indent=2))
+        
+        return {
+            'messages': [COST_OPTIMIZATION_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+            'model': self.model,
+            'temperature': 0.3,
+            'max_tokens': 1024
+        }
+    
+    def generate_executive_summary(self, project_data: Dict) -> str:
+        """
+        Generate executive summary for investment decision
+        """
+        try:
+            response = self.client.chat.completions.create(**self._executive_summary_request(project_data))
+            return response.choices[0].message.content
+        except Exception as e:
+            return f"⚠️ Error generating summary: {str(e)}"
+    
+    def _executive_summary_request(self, project_data: Dict) -> Dict:
+        """
+        Chat completion request for generate_executive_summary
+        """
+        prompt = EXECUTIVE_SUMMARY_PROMPT.format(
+            name=project_data.get('name', 'Chemical Process Investment'),
+            investment=project_data.get('investment', 0),
+            npv=project_data.get('npv', 0),
+            irr=project_data.get('irr', 0),
+            payback=project_data.get('payback', 0),
+            production_rate=project_data.get('production_rate', 0)
+        )
+        
+        return {
+            'messages': [EXECUTIVE_SUMMARY_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+            'model': self.model,
+            'temperature': 0.2,
+            'max_tokens': 512
+        }
+    
+    def compare_alternatives(self, alternatives: List[Dict]) -> str:
+        """
+        Compare multiple process alternatives
+        """
+        comparison_data = "".join(
+            ALTERNATIVE_ENTRY.format(
+                number=i + 1,
+                name=alt.get('name', f'Option {i+1}'),
+                npv=alt.get('npv', 0),
+                irr=alt.get('irr', 0),
+                payback=alt.get('payback', 0),
+                capex=alt.get('capex', 0)
+            )
+            for i, alt in enumerate(alternatives)
+        )
+        prompt = ALTERNATIVES_PROMPT.format(comparison_data=comparison_data)
         
         try:
             response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are comparing investment alternatives. Consider both quantitative and qualitative factors."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
+                messages=[ALTERNATIVES_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
                 model=self.model,
                 temperature=0.3,
                 max_tokens=1024
@@ -239,21 +359,7 @@ Consider both financial metrics and strategic factors.
         """
         Build formatted context from process data
         """
-        context = []
-        
-        if 'process_type' in data:
-            context.append(f"Process Type: {data['process_type']}")
-        if 'production_rate' in data:
-            context.append(f"Production Rate: {data['production_rate']} tons/year")
-        if 'raw_materials' in data:
-            materials = [mat if isinstance(mat, str) else mat.get('name', 'Unknown') 
-                        for mat in data['raw_materials']]
-            context.append(f"Raw Materials: {', '.join(materials)}")
-        if 'products' in data:
-            context.append(f"Products: {', '.join(data['products'])}")
-        if 'investment' in data:
-            context.append(f"Total Investment: ${data['investment']:,.2f}")
-        if 'operating_hours' in data:
-            context.append(f"Operating Hours: {data['operating_hours']} hours/year")
+        context = [template.format(_context_value(key, data[key]))
+                   for key, template in PROCESS_CONTEXT_FIELDS if key in data]
         
         return '\n'.join(context) if context else "No specific process data provided"
@@ -7,6 +7,9 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 
+# Streams and components the flow matrix has room for before it first grows
+INITIAL_CAPACITY = 8
+
 class MaterialBalanceCalculator:
     """
     Class for performing material balance calculations
@@ -16,6 +19,15 @@ class MaterialBalanceCalculator:
         self.components = {}
         self.streams = {}
         self.reactions = {}
+        # Component mass flows of every stream, one row per stream and one column
+        # per component carried by any stream (kg/h). Rows and columns are allocated
+        # with spare capacity that doubles when full; unused entries stay zero
+        self._flows = np.zeros((INITIAL_CAPACITY, INITIAL_CAPACITY))
+        # Total mass flow (kg/h), temperature (°C) and pressure (bar) of every stream,
+        # aligned with the flow matrix rows
+        self._conditions = np.zeros((INITIAL_CAPACITY, 3))
+        self._stream_index = {}
+        self._component_index = {}
     
     def add_component(self, name: str, molecular_weight: float, 
                      phase: str = "liquid", density: Optional[float] = None):
@@ -45,13 +57,53 @@ class MaterialBalanceCalculator:
             temperature: Temperature (°C)
             pressure: Pressure (bar)
         """
+        row = self._stream_index.get(name)
+        if row is None:
+            row = len(self._stream_index)
+            if row == self._flows.shape[0]:
+                self._flows = self._grow(self._flows, axis=0)
+                self._conditions = self._grow(self._conditions, axis=0)
+            self._stream_index[name] = row
+        else:
+            self._flows[row] = 0.0
+        
+        # Element writes into the row beat a fancy-indexed assignment for a handful of components
+        component_index = self._component_index
+        for component, flow in components.items():
+            column = component_index.get(component)
+            if column is None:
+                column = self._add_component_column(component)
+            self._flows[row, column] = flow
+        
+        total_mass_flow = sum(components.values())
+        self._conditions[row] = (total_mass_flow, temperature, pressure)
+        
         self.streams[name] = {
             'components': components,
             'temperature': temperature,
             'pressure': pressure,
-            'total_mass_flow': sum(components.values())
+            'total_mass_flow': total_mass_flow
         }
     
+    @staticmethod
+    def _grow(array: np.ndarray, axis: int) -> np.ndarray:
+        """
+        Copy of an array with its capacity along an axis doubled, the new entries zero
+        """
+        padding = [(0, 0)] * array.ndim
+        padding[axis] = (0, array.shape[axis])
+        return np.pad(array, padding)
+    
+    def _add_component_column(self, component: str) -> int:
+        """
+        Assign the next flow matrix column to a new component
+        """
+        column = len(self._component_index)
+        if column == self._flows.shape[1]:
+            self._flows = self._grow(self._flows, axis=1)
+        self._component_index[component] = column
+        return column
+    
     def add_reaction(self, name: str, stoichiometry: Dict[str, float], 
                     conversion: float, selectivity: float = 1.0):
         """
@@ -85,7 +137,7 @@ class MaterialBalanceCalculator:
         if reaction_name not in self.reactions:
             raise ValueError(f"Reaction '{reaction_name}' not found")
         
-        inlet = self.streams[inlet_stream]['components'].copy()
+        inlet = self.streams[inlet_stream]['components']
         reaction = self.reactions[reaction_name]
         stoichiometry = reaction['stoichiometry']
         conversion = reaction['conversion']
@@ -103,21 +155,15 @@ class MaterialBalanceCalculator:
                     limiting_reactant = component
         
         if limiting_reactant is None:
-            return {'components': inlet, 'conversion_achieved': 0}
+            return {'components': inlet.copy(), 'conversion_achieved': 0}
         
         # Calculate actual extent of reaction
         actual_extent = min_extent * conversion * selectivity
         
-        # Update component flows
+        # Update component flows, ensuring non-negative flows
         outlet = inlet.copy()
         for component, coeff in stoichiometry.items():
-            if component in outlet:
-                outlet[component] += coeff * actual_extent
-            else:
-                outlet[component] = max(0, coeff * actual_extent)
-            
-            # Ensure non-negative flows
-            outlet[component] = max(0, outlet[component])
+            outlet[component] = max(0, outlet.get(component, 0) + coeff * actual_extent)
         
         conversion_achieved = (inlet[limiting_reactant] - outlet[limiting_reactant]) / inlet[limiting_reactant]
         
@@ -192,28 +238,25 @@ class MaterialBalanceCalculator:
         Returns:
             DataFrame with material balance
         """
-        # Get all components
-        all_components = set()
-        for stream_data in self.streams.values():
-            all_components.update(stream_data['components'].keys())
-        
-        # Create balance table
-        balance_data = []
-        
-        for stream_name, stream_data in self.streams.items():
-            row = {'Stream': stream_name}
-            
-            # Add component flows
-            for component in sorted(all_components):
-                flow = stream_data['components'].get(component, 0)
-                row[f'{component} (kg/h)'] = flow
-            
-            # Add total flow and conditions
-            row['Total Flow (kg/h)'] = stream_data['total_mass_flow']
-            row['Temperature (°C)'] = stream_data.get('temperature', 25)
-            row['Pressure (bar)'] = stream_data.get('pressure', 1.0)
-            
-            balance_data.append(row)
+        if not self.streams:
+            return pd.DataFrame()
+        
+        # Component flows straight from the flow matrix, components sorted by name;
+        # rows follow the stream order, as the stream index does. Columns of components
+        # no stream carries any more (after re-adding a stream without them) are left out
+        components = sorted(set().union(*(stream_data['components'] for stream_data in self.streams.values())))
+        columns = [self._component_index[component] for component in components]
+        n_streams = len(self._stream_index)
+        flows = self._flows[:n_streams, columns]
+        totals, temperatures, pressures = self._conditions[:n_streams].T
+        
+        balance_data = {'Stream': list(self._stream_index)}
+        balance_data.update(zip([f'{component} (kg/h)' for component in components], flows.T))
+        
+        # Add total flow and conditions
+        balance_data['Total Flow (kg/h)'] = totals
+        balance_data['Temperature (°C)'] = temperatures
+        balance_data['Pressure (bar)'] = pressures
         
         return pd.DataFrame(balance_data)
     
@@ -3,29 +3,72 @@
 Common calculation functions for chemical process economics
 """
 
+import math
 import numpy as np
 import pandas as pd
 from typing import List, Dict, Tuple, Optional
 
-def calculate_npv(cash_flows: List[float], discount_rate: float) -> float:
+def calculate_discount_factors(discount_rate, n_periods: int) -> np.ndarray:
+    """
+    Calculate discount factors 1/(1+r)^t for t = 0..n_periods-1
+    
+    Args:
+        discount_rate: Discount rate as decimal, or an array of rates
+        n_periods: Number of periods, including year 0
+    
+    Returns:
+        Array of discount factors; one row per rate when given an array of rates
+    """
+    rate = np.asarray(discount_rate, dtype=np.float64)[..., None]
+    factors = np.ones(rate.shape[:-1] + (n_periods,))
+    factors[..., 1:] = 1 / (1 + rate)
+    return np.cumprod(factors, axis=-1)
+
+def calculate_npv(cash_flows: List[float], discount_rate: float,
+                  discount_factors: Optional[np.ndarray] = None):
     """
     Calculate Net Present Value (NPV)
     
     Args:
-        cash_flows: List of annual cash flows (negative for investments, positive for profits)
-        discount_rate: Discount rate as decimal (e.g., 0.12 for 12%)
+        cash_flows: List of annual cash flows (negative for investments, positive for profits),
+                    or an array with one cash flow series per row
+        discount_rate: Discount rate as decimal (e.g., 0.12 for 12%), or one rate per row
+        discount_factors: Precomputed discount factors for discount_rate (optional)
     
     Returns:
-        NPV value
+        NPV value; an array of NPVs, one per row, for a 2-D cash flow array
     """
     try:
-        npv = 0
-        for i, cash_flow in enumerate(cash_flows):
-            npv += cash_flow / ((1 + discount_rate) ** i)
-        return npv
+        cash_flows = np.asarray(cash_flows, dtype=np.float64)
+        if discount_factors is None:
+            discount_factors = calculate_discount_factors(discount_rate, cash_flows.shape[-1])
+        
+        # Row-wise dot product, without a temporary for the discounted cash flows
+        npv = np.einsum('...t,...t->...', cash_flows, discount_factors)
+        return float(npv) if npv.ndim == 0 else npv
     except Exception as e:
         raise ValueError(f"Error calculating NPV: {str(e)}")
 
+def _irr_from_roots(cash_flows: np.ndarray, fallback: float) -> float:
+    """
+    IRR from the roots of the NPV polynomial in 1/(1+r), for series where Newton-Raphson fails
+    
+    Args:
+        cash_flows: Array of annual cash flows
+        fallback: Rate returned when the polynomial has no root above -100%
+    
+    Returns:
+        IRR as decimal, the root closest to the usual 10% initial guess
+    """
+    roots = np.roots(cash_flows[::-1])
+    # Only real, positive discount factors correspond to rates above -100%
+    factors = roots.real[(np.abs(roots.imag) < 1e-12) & (roots.real > 0)]
+    if factors.size == 0:
+        return fallback
+    
+    rates = 1 / factors - 1
+    return float(rates[np.argmin(np.abs(rates - 0.1))])
+
 def calculate_irr(cash_flows: List[float], max_iterations: int = 1000, tolerance: float = 1e-6) -> float:
     """
     Calculate Internal Rate of Return (IRR) using Newton-Raphson method
@@ -42,13 +85,17 @@ def calculate_irr(cash_flows: List[float], max_iterations: int = 1000, tolerance
         if len(cash_flows) < 2:
             raise ValueError("Need at least 2 cash flows")
         
+        cash_flows = np.asarray(cash_flows, dtype=np.float64)
+        weighted_cash_flows = -np.arange(cash_flows.size) * cash_flows
+        
         # Initial guess
         rate = 0.1
         
         for _ in range(max_iterations):
             # Calculate NPV and its derivative
-            npv = sum(cf / (1 + rate) ** i for i, cf in enumerate(cash_flows))
-            dnpv = sum(-i * cf / (1 + rate) ** (i + 1) for i, cf in enumerate(cash_flows) if i > 0)
+            discount_factors = calculate_discount_factors(rate, cash_flows.size)
+            npv = float(cash_flows @ discount_factors)
+            dnpv = float(weighted_cash_flows @ discount_factors) / (1 + rate)
             
             if abs(npv) < tolerance:
                 return rate
@@ -62,10 +109,56 @@ def calculate_irr(cash_flows: List[float], max_iterations: int = 1000, tolerance
             if rate < -0.99:  # Avoid negative rates close to -100%
                 rate = -0.99
         
-        return rate
+        # Newton-Raphson stalled or did not converge
+        return _irr_from_roots(cash_flows, rate)
     except Exception as e:
         raise ValueError(f"Error calculating IRR: {str(e)}")
 
+def calculate_irrs(cash_flows: np.ndarray, max_iterations: int = 1000, tolerance: float = 1e-6) -> np.ndarray:
+    """
+    Calculate the IRR of many cash flow series at once using Newton-Raphson
+    
+    Args:
+        cash_flows: Array with one cash flow series per row; trailing zeros are allowed
+        max_iterations: Maximum number of iterations
+        tolerance: Convergence tolerance
+    
+    Returns:
+        Array of IRRs as decimals, one per row
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=np.float64))
+    if cash_flows.shape[1] < 2:
+        raise ValueError("Error calculating IRR: Need at least 2 cash flows")
+    
+    weighted_cash_flows = -np.arange(cash_flows.shape[1]) * cash_flows
+    rates = np.full(cash_flows.shape[0], 0.1)
+    # Rows drop out once they converge or their derivative vanishes, as in calculate_irr
+    active = np.ones(cash_flows.shape[0], dtype=bool)
+    converged = np.zeros(cash_flows.shape[0], dtype=bool)
+    
+    for _ in range(max_iterations):
+        rows = np.flatnonzero(active)
+        if rows.size == 0:
+            break
+        
+        rate = rates[rows]
+        discount_factors = calculate_discount_factors(rate, cash_flows.shape[1])
+        npv = (cash_flows[rows] * discount_factors).sum(axis=1)
+        dnpv = (weighted_cash_flows[rows] * discount_factors).sum(axis=1) / (1 + rate)
+        
+        converged[rows[np.abs(npv) < tolerance]] = True
+        stepping = (np.abs(npv) >= tolerance) & (np.abs(dnpv) >= tolerance)
+        active[rows[~stepping]] = False
+        
+        rows = rows[stepping]
+        rates[rows] = np.maximum(rate[stepping] - npv[stepping] / dnpv[stepping], -0.99)
+    
+    # Rows where Newton-Raphson stalled or did not converge are usually rare
+    for row in np.flatnonzero(~converged):
+        rates[row] = _irr_from_roots(cash_flows[row], rates[row])
+    
+    return rates
+
 def calculate_payback_period(initial_investment: float, annual_cash_flows: List[float]) -> float:
     """
     Calculate payback period
@@ -78,23 +171,56 @@ def calculate_payback_period(initial_investment: float, annual_cash_flows: List[
         Payback period in years
     """
     try:
-        cumulative_cash_flow = 0
+        cash_flows = np.asarray(annual_cash_flows, dtype=np.float64)
+        cumulative_cash_flows = np.cumsum(cash_flows)
         
-        for year, cash_flow in enumerate(annual_cash_flows):
-            cumulative_cash_flow += cash_flow
-            
-            if cumulative_cash_flow >= initial_investment:
-                # Linear interpolation for fractional year
-                excess = cumulative_cash_flow - initial_investment
-                fraction = excess / cash_flow
-                return year + 1 - fraction
+        # Cash flows can be negative, so the cumulative sum is not necessarily
+        # sorted; take the first year it reaches the investment
+        recovered = cumulative_cash_flows >= initial_investment
+        if recovered.any():
+            year = int(recovered.argmax())
+            # Linear interpolation for fractional year
+            excess = float(cumulative_cash_flows[year] - initial_investment)
+            return year + 1 - excess / float(cash_flows[year])
         
         # Investment not recovered within given period
-        return len(annual_cash_flows) + (initial_investment - cumulative_cash_flow) / annual_cash_flows[-1]
+        shortfall = float(initial_investment - cumulative_cash_flows[-1])
+        return cash_flows.size + shortfall / float(cash_flows[-1])
     
     except Exception as e:
         raise ValueError(f"Error calculating payback period: {str(e)}")
 
+def calculate_payback_periods(initial_investments: np.ndarray, annual_cash_flows: np.ndarray,
+                              n_years: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Calculate the payback periods of many projects at once
+    
+    Args:
+        initial_investments: Initial capital investment of each project
+        annual_cash_flows: Array with one series of annual cash flows per row
+        n_years: Number of years of each series that count, for rows padded with zeros (optional)
+    
+    Returns:
+        Array of payback periods in years, one per row
+    """
+    cash_flows = np.atleast_2d(np.asarray(annual_cash_flows, dtype=np.float64))
+    investments = np.asarray(initial_investments, dtype=np.float64)
+    n_rows, n_columns = cash_flows.shape
+    n_years = np.full(n_rows, n_columns) if n_years is None else np.asarray(n_years)
+    rows = np.arange(n_rows)
+    
+    cumulative_cash_flows = np.cumsum(cash_flows, axis=1)
+    recovered = ((cumulative_cash_flows >= investments[:, None])
+                 & (np.arange(n_columns) < n_years[:, None]))
+    
+    # First year each investment is recovered; projects that never recover it
+    # are extrapolated from their final year's cash flow, as in calculate_payback_period
+    year = recovered.argmax(axis=1)
+    year = np.where(recovered[rows, year], year, n_years - 1)
+    shortfall = investments - cumulative_cash_flows[rows, year]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return year + 1 + shortfall / cash_flows[rows, year]
+
 def calculate_roi(profit: float, investment: float) -> float:
     """
     Calculate Return on Investment (ROI)
@@ -130,10 +256,28 @@ def equipment_cost_scaling(base_cost: float, base_capacity: float, new_capacity:
         if base_capacity <= 0 or new_capacity <= 0:
             raise ValueError("Capacities must be positive")
         
-        return base_cost * (new_capacity / base_capacity) ** scaling_factor
+        return base_cost * math.pow(new_capacity / base_capacity, scaling_factor)
     except Exception as e:
         raise ValueError(f"Error scaling equipment cost: {str(e)}")
 
+def scaled_equipment_cost(capacity, base_cost, base_capacity, scaling_factor,
+                          material_factor, cepci_ratio: float) -> np.ndarray:
+    """
+    Power-law capacity scaling with material and CEPCI adjustment, element-wise over arrays
+    
+    Args:
+        capacity: Equipment capacities
+        base_cost: Known costs at base capacity
+        base_capacity: Base capacities
+        scaling_factor: Scaling exponents
+        material_factor: Material of construction factors
+        cepci_ratio: Ratio of current to base year CEPCI
+    
+    Returns:
+        Array of final equipment costs
+    """
+    return base_cost * (capacity / base_capacity) ** scaling_factor * material_factor * cepci_ratio
+
 def cepci_cost_update(base_cost: float, base_year_index: float, current_year_index: float) -> float:
     """
     Update cost using Chemical Engineering Plant Cost Index (CEPCI)
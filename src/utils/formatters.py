@@ -3,32 +3,52 @@
 Output formatting functions for ChemEconAI
 """
 
+import math
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 
+# Divisor and suffix per power of one thousand, up to billions
+CURRENCY_SCALES = ((1.0, ''), (1e3, 'K'), (1e6, 'M'), (1e9, 'B'))
+
+@lru_cache(maxsize=4096)
+def _format_currency_cached(amount: float, currency_symbol: str) -> str:
+    """
+    Format a cent-rounded amount; the same totals recur across reruns
+    """
+    if math.isnan(amount):
+        return f"{currency_symbol}nan"
+    
+    # Powers of one thousand in the amount, clamped to the table; amounts below
+    # 1,000 need no thousands separators
+    scale, suffix = CURRENCY_SCALES[int(math.log10(min(max(abs(amount), 1.0), 1e9))) // 3]
+    return f"{currency_symbol}{amount / scale:.2f}{suffix}"
+
 def format_currency(amount: float, currency_symbol: str = "$") -> str:
     """
     Format currency with proper thousands separators
     """
     try:
-        if abs(amount) >= 1e9:
-            return f"{currency_symbol}{amount/1e9:.2f}B"
-        elif abs(amount) >= 1e6:
-            return f"{currency_symbol}{amount/1e6:.2f}M"
-        elif abs(amount) >= 1e3:
-            return f"{currency_symbol}{amount/1e3:.2f}K"
-        else:
-            return f"{currency_symbol}{amount:,.2f}"
+        # Adding 0.0 turns -0.0 into 0.0, which the cache would otherwise treat as the same key
+        return _format_currency_cached(round(amount, 2) + 0.0, currency_symbol)
     except:
         return f"{currency_symbol}0.00"
 
+@lru_cache(maxsize=1024)
+def _format_percentage_cached(value: float, decimal_places: int) -> str:
+    """
+    Format a percentage; the same metrics recur across reruns
+    """
+    return f"{value:.{decimal_places}f}%"
+
 def format_percentage(value: float, decimal_places: int = 2) -> str:
     """
     Format percentage with specified decimal places
     """
     try:
-        return f"{value:.{decimal_places}f}%"
+        # Adding 0.0 turns -0.0 into 0.0, which the cache would otherwise treat as the same key
+        return _format_percentage_cached(value + 0.0, decimal_places)
     except:
         return "0.00%"
 
@@ -70,4 +90,4 @@ def create_summary_table(data: Dict[str, Any], title: str = "Summary") -> pd.Dat
         
         return pd.DataFrame(summary_data)
     except Exception as e:
-        return pd.DataFrame({'Error': [f"Could not create summary: {str(e)}"]}
+        return pd.DataFrame({'Error': [f"Could not create summary: {str(e)}"]})
@@ -11,6 +11,19 @@ class ValidationError(Exception):
     """Custom exception for validation errors"""
     pass
 
+def _parse_number(value: Any) -> Optional[float]:
+    """
+    Convert a value to float, or None if it is not a number
+    """
+    # bool is a subclass of int, but True/False are not valid quantities
+    if isinstance(value, (bool, np.bool_)):
+        return None
+    
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
 def validate_positive_number(value: Any, field_name: str) -> float:
     """
     Validate that a value is a positive number
@@ -25,37 +38,34 @@ def validate_positive_number(value: Any, field_name: str) -> float:
     Raises:
         ValidationError: If validation fails
     """
-    try:
-        num_value = float(value)
-        if num_value <= 0:
-            raise ValidationError(f"{field_name} must be a positive number")
-        return num_value
-    except (ValueError, TypeError):
+    num_value = _parse_number(value)
+    if num_value is None:
         raise ValidationError(f"{field_name} must be a valid number")
+    if num_value <= 0:
+        raise ValidationError(f"{field_name} must be a positive number")
+    return num_value
 
 def validate_non_negative_number(value: Any, field_name: str) -> float:
     """
     Validate that a value is a non-negative number
     """
-    try:
-        num_value = float(value)
-        if num_value < 0:
-            raise ValidationError(f"{field_name} cannot be negative")
-        return num_value
-    except (ValueError, TypeError):
+    num_value = _parse_number(value)
+    if num_value is None:
         raise ValidationError(f"{field_name} must be a valid number")
+    if num_value < 0:
+        raise ValidationError(f"{field_name} cannot be negative")
+    return num_value
 
 def validate_percentage(value: Any, field_name: str, max_percent: float = 100) -> float:
     """
     Validate percentage input
     """
-    try:
-        num_value = float(value)
-        if not (0 <= num_value <= max_percent):
-            raise ValidationError(f"{field_name} must be between 0 and {max_percent}%")
-        return num_value
-    except (ValueError, TypeError):
+    num_value = _parse_number(value)
+    if num_value is None:
         raise ValidationError(f"{field_name} must be a valid percentage")
+    if not (0 <= num_value <= max_percent):
+        raise ValidationError(f"{field_name} must be between 0 and {max_percent}%")
+    return num_value
 
 def validate_process_parameters(params: Dict[str, Any]) -> Dict[str, Any]:
     """